@@ -1,16 +1,25 @@
 # app.py - Frontend + Backend Combined
 import os
-from flask import Flask, request, render_template, redirect, url_for, flash, send_from_directory, send_file, jsonify
+from flask import Flask, request, render_template, redirect, url_for, flash, send_from_directory, send_file, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import pandas as pd
 from datetime import datetime
 
-from core.sbox_generator import generate_sbox, generate_sbox_from_matrix
-from core.sbox_validator import is_bijective, is_balanced, check_sac, differential_uniformity, nonlinearity, calculate_sac_value
-from core.utils import allowed_file, bit_balance, avalanche_test
+from core.sbox_generator import generate_sbox, generate_sbox_from_matrix, generate_sbox_all_polys, parse_constant
+from core.utils import allowed_file
 from core.sbox_examples import SBOX1, SBOX2, SBOX3
-from core.matrix_explorer import explore_affine_candidates, get_top_candidates
+from core.matrix_explorer import explore_affine, explore_affine_stream, explore_affine_candidates, get_top_candidates, merge_top, EXPLORER_THRESHOLDS
+from core.gf2_linalg import pack_matrix, is_invertible
+from core.field_gf256 import format_poly, parse_poly, parse_polys
+from core.sbox import SBox
+from core.sbox_analysis import analyze_sbox
+from core.sbox_batch import evaluate_batch, batch_records, parse_thresholds
+from core.local_search import local_search, STRATEGIES
+from core.matrix_families import explore_family, FAMILIES
+from core.power_maps import sweep_power_maps
+from core.affine import AES_MATRIX, C_BYTE
+from services import candidate_store, job_queue
 from services.excel_service import read_sbox_from_excel, read_sbox_from_file, export_sbox_to_excel, export_analysis_to_excel, GENERATED_DIR
 from services.image_encrypt import apply_subbytes_to_image, image_entropy, npcr, histogram_counts, histogram_rgb, uaci
 from services.aes_service import (
@@ -160,14 +169,20 @@ def analyze():
     report['message'] = msg
     report['matrix_html'] = pd.DataFrame(mat).to_html(classes='table table-sm', header=False, index=False)
 
-    report['bit_balance'] = bit_balance(flat)
-    report['avalanche'] = {f'bit_{b}': round(avalanche_test(flat, flip_bit=b), 4) for b in range(8)}
+    try:
+        flat = SBox(flat)
+    except ValueError as e:
+        flash(f"S-box tidak valid: {e}")
+        return redirect(url_for('index'))
+    m = analyze_sbox(flat, ['bit_balance', 'avalanche', 'bijective', 'balanced', 'sac_pass', 'du', 'nl'])
+    report['bit_balance'] = m['bit_balance']
+    report['avalanche'] = m['avalanche']
 
-    report['bijective'] = is_bijective(flat)
-    report['balanced'] = is_balanced(flat)
-    report['sac'] = check_sac(flat)
-    report['differential_uniformity'] = differential_uniformity(flat)
-    report['nonlinearity'] = nonlinearity(flat)
+    report['bijective'] = m['bijective']
+    report['balanced'] = m['balanced']
+    report['sac'] = m['sac_pass']
+    report['differential_uniformity'] = m['du']
+    report['nonlinearity'] = m['nl']
 
     if 'sample_img' in request.files and request.files['sample_img'].filename != '':
         imgf = request.files['sample_img']
@@ -274,9 +289,6 @@ def api_generate():
     
     if use_random:
         from core.matrix_explorer import explore_affine_candidates
-        if seed is not None:
-            import numpy as np
-            np.random.seed(seed)
         results = explore_affine_candidates(n_candidates=1, seed=seed)
         sbox = results[0]['sbox']
         return jsonify({
@@ -313,31 +325,153 @@ def api_generate_excel():
     return send_file(path, as_attachment=True, download_name=fname)
 
 
+def _validation_metrics(sbox):
+    m = analyze_sbox(sbox, ['bijective', 'balanced', 'sac_pass', 'du', 'nl'])
+    return {
+        "bijective": m['bijective'],
+        "balanced": m['balanced'],
+        "sac": m['sac_pass'],
+        "differential_uniformity": m['du'],
+        "nonlinearity": m['nl']
+    }
+
+
 @app.route('/api/validate-sbox', methods=['POST'])
 def api_validate_sbox():
     data = request.get_json()
-    sbox = data.get("sbox")
-    result = {
-        "bijective": is_bijective(sbox),
-        "balanced": is_balanced(sbox),
-        "sac": check_sac(sbox),
-        "differential_uniformity": differential_uniformity(sbox),
-        "nonlinearity": nonlinearity(sbox)
-    }
-    return jsonify(result)
+    try:
+        sbox = SBox(data.get("sbox"))
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"S-box tidak valid: {e}"}), 400
+    return jsonify(_validation_metrics(sbox))
 
 
 @app.route('/api/validate-sbox-debug', methods=['GET'])
 def api_validate_sbox_debug():
-    sbox = generate_sbox()
-    result = {
-        "bijective": is_bijective(sbox),
-        "balanced": is_balanced(sbox),
-        "sac": check_sac(sbox),
-        "differential_uniformity": differential_uniformity(sbox),
-        "nonlinearity": nonlinearity(sbox)
+    return jsonify(_validation_metrics(generate_sbox()))
+
+
+def _analyze_report(sbox_path, img_name=None, progress=None):
+    """
+    Laporan lengkap /api/analyze untuk file S-box yang sudah tersimpan, plus
+    analisis gambar (img_name di UPLOAD_FOLDER) jika ada. Raise ValueError
+    jika file S-box tidak bisa dibaca.
+    """
+    print(f'📁 Reading S-box from: {sbox_path}')
+    try:
+        flat, mat = read_sbox_from_file(sbox_path)
+    except ValueError:
+        raise
+    except Exception as ex:
+        raise ValueError(f'Failed to read S-box file: {str(ex)}. Try exporting as CSV or JSON instead.')
+    print(f'✓ Read S-box: {len(flat)} values')
+
+    ok, msg = validate_sbox_format(flat)
+    flat = SBox(flat)  # buffer 256 byte; metric & konversi tidak alokasi ulang
+    m = analyze_sbox(flat, ['bit_balance', 'avalanche', 'bijective', 'balanced', 'sac_pass', 'sac', 'sac_matrix',
+                            'sac_dist_max', 'sac_dist_mean', 'absolute_indicator', 'sum_of_squares',
+                            'act_spectrum', 'du', 'dap',
+                            'diff_spectrum', 'nl', 'bic_nl', 'bic_sac', 'bic_sac_matrix', 'bic_corr_max',
+                            'alg_deg', 'alg_deg_min', 'anf_terms', 'to', 'to_original', 'bu', 'bct_spectrum'])
+    bit_bal = m['bit_balance']  # Returns list of 8 values
+    report = {
+        'valid': ok,
+        'message': msg,
+        'matrix': flat.to_matrix(),
+        'sbox': flat.tolist(),
+        'bit_balance': float(sum(bit_bal)) / 8.0,  # Average bit balance
+        'bit_balance_per_bit': bit_bal,  # Per-bit details
+        'avalanche': m['avalanche'],
+        'bijective': m['bijective'],
+        'balanced': m['balanced'],
+        'sac': m['sac_pass'],
+        'sac_value': m['sac'],
+        'sac_matrix': m['sac_matrix'],
+        'sac_dist_max': m['sac_dist_max'],
+        'sac_dist_mean': m['sac_dist_mean'],
+        'absolute_indicator': m['absolute_indicator'],
+        'sum_of_squares': m['sum_of_squares'],
+        'act_spectrum': m['act_spectrum'],
+        'differential_uniformity': m['du'],
+        'dap': m['dap'],
+        'differential_spectrum': m['diff_spectrum'],
+        'nonlinearity': m['nl'],
+        'bic_nl': m['bic_nl'],
+        'bic_sac': m['bic_sac'],
+        'bic_sac_matrix': m['bic_sac_matrix'],
+        'bic_corr_max': m['bic_corr_max'],
+        'alg_deg': m['alg_deg'],
+        'alg_deg_min': m['alg_deg_min'],
+        'anf_terms': m['anf_terms'],
+        'transparency_order': m['to'],
+        'transparency_order_original': m['to_original'],
+        'boomerang_uniformity': m['bu'],
+        'bct_spectrum': m['bct_spectrum']
     }
-    return jsonify(result)
+    if progress is not None:
+        progress(0.3)
+
+    # Optional image analysis - ALWAYS run even if S-box invalid
+    if img_name:
+        img_path = os.path.join(UPLOAD_FOLDER, img_name)
+        try:
+            cipher_name = 'cipher_' + img_name
+            cipher_path = os.path.join(ENCRYPTED_FOLDER, cipher_name)
+            apply_subbytes_to_image(img_path, flat, cipher_path)
+
+            # Create modified plaintext for NPCR
+            from PIL import Image
+            import numpy as np
+            im = Image.open(img_path).convert('RGB')
+            arr = np.array(im)
+            arr2 = arr.copy()
+            arr2[0, 0, 0] = (int(arr2[0, 0, 0]) + 1) % 256
+            mod_plain = os.path.join(ENCRYPTED_FOLDER, 'plain_mod_' + img_name)
+            Image.fromarray(arr2).save(mod_plain)
+
+            cipher_mod = os.path.join(ENCRYPTED_FOLDER, 'cipher_mod_' + img_name)
+            apply_subbytes_to_image(mod_plain, flat, cipher_mod)
+
+            # Get histogram data and ensure JSON-safe
+            hist_rgb_plain_data = histogram_rgb(img_path)
+            hist_rgb_cipher_data = histogram_rgb(cipher_path)
+            hist_plain_data = histogram_counts(img_path)
+            hist_cipher_data = histogram_counts(cipher_path)
+
+            # Convert to Python lists if numpy
+            report['image_analysis'] = {
+                'image_name': img_name,
+                'cipher_name': cipher_name,
+                'entropy': float(round(image_entropy(cipher_path), 6)),
+                'npcr': float(round(npcr(cipher_path, cipher_mod), 6)),
+                'hist_plain': [int(x) for x in hist_plain_data],
+                'hist_cipher': [int(x) for x in hist_cipher_data],
+                'hist_rgb_plain': {
+                    'r': [int(x) for x in hist_rgb_plain_data.get('r', [])],
+                    'g': [int(x) for x in hist_rgb_plain_data.get('g', [])],
+                    'b': [int(x) for x in hist_rgb_plain_data.get('b', [])]
+                },
+                'hist_rgb_cipher': {
+                    'r': [int(x) for x in hist_rgb_cipher_data.get('r', [])],
+                    'g': [int(x) for x in hist_rgb_cipher_data.get('g', [])],
+                    'b': [int(x) for x in hist_rgb_cipher_data.get('b', [])]
+                }
+            }
+        except Exception as e:
+            report['image_error'] = str(e)
+            import traceback
+            traceback.print_exc()
+
+    return report
+
+
+def _save_sample_image(imgf, prefix=''):
+    """Simpan gambar sample (opsional) ke UPLOAD_FOLDER; return nama file atau None"""
+    if imgf is None or imgf.filename == '' or not allowed_file(imgf.filename, ALLOWED_IMAGES):
+        return None
+    img_name = prefix + secure_filename(imgf.filename)
+    imgf.save(os.path.join(UPLOAD_FOLDER, img_name))
+    return img_name
 
 
 @app.route('/api/analyze', methods=['POST'])
@@ -358,93 +492,10 @@ def api_analyze_sbox():
         sbox_path = os.path.join(UPLOAD_FOLDER, sbox_fname)
         sbox_file.save(sbox_path)
         
-        print(f'📁 Reading S-box from: {sbox_path}')
         try:
-            flat, mat = read_sbox_from_file(sbox_path)
+            report = _analyze_report(sbox_path, _save_sample_image(request.files.get('sample_img')))
         except ValueError as ve:
-            return jsonify({
-                'error': str(ve),
-                'valid': False
-            }), 400
-        except Exception as ex:
-            return jsonify({
-                'error': f'Failed to read S-box file: {str(ex)}. Try exporting as CSV or JSON instead.',
-                'valid': False
-            }), 400
-        print(f'✓ Read S-box: {len(flat)} values')
-
-        ok, msg = validate_sbox_format(flat)
-        bit_bal = bit_balance(flat)  # Returns list of 8 values
-        report = {
-            'valid': ok,
-            'message': msg,
-            'matrix': mat.tolist(),
-            'sbox': [int(x) for x in flat],
-            'bit_balance': float(sum(bit_bal)) / 8.0,  # Average bit balance
-            'bit_balance_per_bit': [int(x) for x in bit_bal],  # Per-bit details
-            'avalanche': {f'bit_{b}': round(avalanche_test(flat, flip_bit=b), 4) for b in range(8)},
-            'bijective': bool(is_bijective(flat)),
-            'balanced': bool(is_balanced(flat)),
-            'sac': bool(check_sac(flat)),
-            'differential_uniformity': int(differential_uniformity(flat)),
-            'nonlinearity': int(nonlinearity(flat))
-        }
-
-        # Optional image analysis - ALWAYS run even if S-box invalid
-        if 'sample_img' in request.files and request.files['sample_img'].filename != '':
-            imgf = request.files['sample_img']
-            if imgf and allowed_file(imgf.filename, ALLOWED_IMAGES):
-                try:
-                    img_name = secure_filename(imgf.filename)
-                    img_path = os.path.join(UPLOAD_FOLDER, img_name)
-                    imgf.save(img_path)
-
-                    cipher_name = 'cipher_' + img_name
-                    cipher_path = os.path.join(ENCRYPTED_FOLDER, cipher_name)
-                    apply_subbytes_to_image(img_path, flat, cipher_path)
-
-                    # Create modified plaintext for NPCR
-                    from PIL import Image
-                    import numpy as np
-                    im = Image.open(img_path).convert('RGB')
-                    arr = np.array(im)
-                    arr2 = arr.copy()
-                    arr2[0, 0, 0] = (int(arr2[0, 0, 0]) + 1) % 256
-                    mod_plain = os.path.join(ENCRYPTED_FOLDER, 'plain_mod_' + img_name)
-                    Image.fromarray(arr2).save(mod_plain)
-                    
-                    cipher_mod = os.path.join(ENCRYPTED_FOLDER, 'cipher_mod_' + img_name)
-                    apply_subbytes_to_image(mod_plain, flat, cipher_mod)
-
-                    # Get histogram data and ensure JSON-safe
-                    hist_rgb_plain_data = histogram_rgb(img_path)
-                    hist_rgb_cipher_data = histogram_rgb(cipher_path)
-                    hist_plain_data = histogram_counts(img_path)
-                    hist_cipher_data = histogram_counts(cipher_path)
-
-                    # Convert to Python lists if numpy
-                    report['image_analysis'] = {
-                        'image_name': img_name,
-                        'cipher_name': cipher_name,
-                        'entropy': float(round(image_entropy(cipher_path), 6)),
-                        'npcr': float(round(npcr(cipher_path, cipher_mod), 6)),
-                        'hist_plain': [int(x) for x in hist_plain_data],
-                        'hist_cipher': [int(x) for x in hist_cipher_data],
-                        'hist_rgb_plain': {
-                            'r': [int(x) for x in hist_rgb_plain_data.get('r', [])],
-                            'g': [int(x) for x in hist_rgb_plain_data.get('g', [])],
-                            'b': [int(x) for x in hist_rgb_plain_data.get('b', [])]
-                        },
-                        'hist_rgb_cipher': {
-                            'r': [int(x) for x in hist_rgb_cipher_data.get('r', [])],
-                            'g': [int(x) for x in hist_rgb_cipher_data.get('g', [])],
-                            'b': [int(x) for x in hist_rgb_cipher_data.get('b', [])]
-                        }
-                    }
-                except Exception as e:
-                    report['image_error'] = str(e)
-                    import traceback
-                    traceback.print_exc()
+            return jsonify({'error': str(ve), 'valid': False}), 400
 
         return jsonify(report)
     
@@ -458,13 +509,76 @@ def api_analyze_sbox():
         }), 500
 
 
+_BATCH_ANALYZER_METRICS = ['nl', 'sac', 'bic_sac', 'lap', 'max_bias', 'linear_spectrum', 'dap', 'du',
+                           'diff_spectrum', 'bic_nl', 'alg_deg', 'to', 'bijective', 'balanced', 'sac_pass']
+
+
+def _sbox_metrics(sbox):
+    """Metric lengkap (format batch analyzer) dalam satu pass engine"""
+    return _format_sbox_metrics(analyze_sbox(sbox, _BATCH_ANALYZER_METRICS))
+
+
+def _sbox_metrics_batch(sboxes):
+    """_sbox_metrics untuk banyak S-box sekaligus lewat kernel batch (N, 256)"""
+    if not sboxes:
+        return []
+    records = batch_records(evaluate_batch(sboxes, _BATCH_ANALYZER_METRICS))
+    return [_format_sbox_metrics(m) for m in records]
+
+
+def _format_sbox_metrics(m):
+    return {
+        'nl': m['nl'],
+        'sac': round(m['sac'], 4),
+        'bic_sac': round(m['bic_sac'], 4),
+        'lap': m['lap'],
+        'lap_bias': m['max_bias'],
+        'linear_spectrum': m['linear_spectrum'],
+        'dap_prob': m['dap'],
+        'du': m['du'],
+        'diff_spectrum': m['diff_spectrum'],
+        'bic_nl': m['bic_nl'],
+        'alg_deg': m['alg_deg'],
+        'tg': round(m['to'], 4),  # revised transparency order
+        'bijective': m['bijective'],
+        'balanced': m['balanced'],
+        'sac_pass': m['sac_pass']
+    }
+
+
+def batch_score(metrics):
+    """
+    Skor ringkas 0..100 untuk metric format batch analyzer (sama dengan
+    calculateScore di batch_sbox_analyzer.html): NL 30%, SAC 20%, BIC-NL 20%,
+    DU 15%, TO 15%. TO lebih kecil lebih baik, dinilai terhadap batas n = 8.
+    """
+    try:
+        if not isinstance(metrics, dict):
+            return 0
+        nl = float(metrics.get('nl', 0) or 0) / 112.0
+        sac = float(metrics.get('sac', 0) or 0) / 0.5
+        bic_nl = float(metrics.get('bic_nl', 0) or 0) / 112.0
+        du_val = float(metrics.get('du', 1) or 1)
+        du = 1.0 / (1.0 + du_val)
+        tg = (8.0 - float(metrics.get('tg', 8.0))) / 8.0
+        score = (nl * 0.3 + sac * 0.2 + bic_nl * 0.2 + du * 0.15 + tg * 0.15) * 100
+        return max(0, min(100, score))  # Clamp to 0-100
+    except (TypeError, ValueError):
+        return 0
+
+
 @app.route('/api/sbox/generate-from-matrix', methods=['POST'])
 def api_generate_sbox_from_matrix():
-    """Generate S-box from custom matrix and constant"""
+    """
+    Generate S-box from custom matrix and constant.
+    'poly' opsional: hex polynomial (default 11B) atau "all" untuk S-box +
+    metric di atas 30 polynomial irreducible sekaligus.
+    """
     try:
         data = request.get_json()
         matrix = data.get('matrix')
         constant = data.get('constant', '63')
+        poly = data.get('poly')
         
         if not matrix or len(matrix) != 8:
             return jsonify({'error': 'Matrix harus 8x8'}), 400
@@ -473,35 +587,79 @@ def api_generate_sbox_from_matrix():
             if len(row) != 8:
                 return jsonify({'error': 'Setiap row harus 8 bit'}), 400
         
-        sbox = generate_sbox_from_matrix(matrix, constant)
+        try:
+            if not is_invertible(pack_matrix(matrix)):
+                return jsonify({'error': 'Matrix tidak invertible di GF(2), S-box tidak akan bijektif'}), 400
+        except ValueError as ve:
+            return jsonify({'error': str(ve)}), 400
         
-        # Compute cryptographic metrics
-        sac_value = calculate_sac_value(sbox)
-        metrics = {
-            'nl': nonlinearity(sbox),
-            'sac': round(sac_value, 4),
-            'bic_sac': round(sac_value, 4),  # Simplified - can add BIC-SAC later
-            'lap': 16,  # Placeholder - needs LAP implementation
-            'dap_prob': round(differential_uniformity(sbox) / 256, 4),  # Approximate DAP
-            'du': differential_uniformity(sbox),
-            'bic_nl': nonlinearity(sbox),  # Simplified - same as NL for now
-            'alg_deg': 7,  # Placeholder - needs algebraic degree implementation
-            'tg': 7.9731,  # Placeholder - needs transparency order implementation
-            'bijective': is_bijective(sbox),
-            'balanced': is_balanced(sbox),
-            'sac_pass': check_sac(sbox)
-        }
+        try:
+            polys = parse_polys(poly)
+            parse_constant(constant)
+        except (TypeError, ValueError) as ve:
+            return jsonify({'error': str(ve)}), 400
+        
+        if len(polys) > 1:
+            generated = generate_sbox_all_polys(matrix, constant)
+            all_metrics = _sbox_metrics_batch([sbox for _, sbox in generated])
+            return jsonify({
+                'matrix': matrix,
+                'constant': constant,
+                'poly': 'all',
+                'results': [{'poly': p, 'sbox': sbox, 'metrics': m}
+                            for (p, sbox), m in zip(generated, all_metrics)]
+            })
+        
+        sbox = generate_sbox_from_matrix(matrix, constant, polys[0])
+        metrics = _sbox_metrics(sbox)
         
         return jsonify({
             'sbox': sbox,
             'matrix': matrix,
             'constant': constant,
+            'poly': format_poly(polys[0]),
             'metrics': metrics
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/power-maps', methods=['GET', 'POST'])
+def api_power_maps():
+    """
+    Sweep S-box power mapping x^d untuk semua 128 exponent coprime dengan 255,
+    ranked berdasarkan NL, DU lalu derajat aljabar.
+    Query: poly (hex, default 11B), affine=aes untuk stage affine generate_sbox()
+    (AES_MATRIX, C_BYTE; d = 254 menghasilkan S-box default).
+    POST body opsional {"matrix": 8x8, "constant": hex_str} untuk stage affine custom.
+    """
+    data = request.get_json(silent=True) or {}
+    matrix = data.get('matrix')
+    constant = data.get('constant', '63')
+    if matrix is None and request.args.get('affine', default='none').lower() == 'aes':
+        matrix, constant = AES_MATRIX.tolist(), C_BYTE
+    try:
+        poly = parse_poly(request.args.get('poly', default=data.get('poly')))
+        if matrix is not None:
+            if len(matrix) != 8 or any(len(row) != 8 for row in matrix):
+                return jsonify({'error': 'Matrix harus 8x8'}), 400
+            if not is_invertible(pack_matrix(matrix)):
+                return jsonify({'error': 'Matrix tidak invertible di GF(2), S-box tidak akan bijektif'}), 400
+            constant = parse_constant(constant)
+        results = sweep_power_maps(poly, matrix, constant if matrix is not None else 0)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'poly': format_poly(poly),
+        'matrix': matrix,
+        'constant': f"{constant:02X}" if matrix is not None else None,
+        'count': len(results),
+        'classes': len({r['cyclotomic_class'] for r in results}),
+        'results': results
+    })
+
+
 @app.route('/api/sbox/export-excel', methods=['POST'])
 def api_export_sbox_excel():
     """Export S-box and analysis to Excel"""
@@ -522,11 +680,7 @@ def api_export_sbox_excel():
             'metrics': {
                 'preset': preset,
                 'constant': f'0x{constant}',
-                'bijective': is_bijective(sbox),
-                'balanced': is_balanced(sbox),
-                'sac': check_sac(sbox),
-                'differential_uniformity': differential_uniformity(sbox),
-                'nonlinearity': nonlinearity(sbox)
+                **_validation_metrics(sbox)
             }
         }
         
@@ -541,156 +695,166 @@ def api_export_sbox_excel():
         return jsonify({'error': str(e)}), 500
 
 
+def _batch_export_workbook(results, progress=None):
+    """
+    Bangun workbook batch analysis (Summary, S-Boxes, Matrices) dari list hasil
+    batch analyzer; return path file. Raise ValueError jika tidak ada S-box valid.
+    """
+    if not results:
+        raise ValueError('No results to export')
+
+    # Validate and clean data
+    cleaned_results = []
+    client_metrics = []
+    for result in results:
+        if isinstance(result, dict):
+            # Extract sbox (should be a list of 256 ints)
+            sbox = result.get('sbox', [])
+            if isinstance(sbox, list) and len(sbox) == 256:
+                # Normalize via SBox (validasi rentang 0..255 + int Python)
+                try:
+                    sbox = SBox(sbox).tolist()
+                except (ValueError, TypeError):
+                    continue
+
+                # Extract matrix (should be list of lists)
+                matrix = result.get('matrix', [])
+                if not isinstance(matrix, list):
+                    matrix = []
+
+                # Score dari metric yang diukur server-side, bukan nilai kiriman client
+                metrics = result.get('metrics', {})
+                if not isinstance(metrics, dict):
+                    metrics = {}
+                client_metrics.append(metrics)
+
+                cleaned_results.append({
+                    'name': result.get('name', 'Unknown'),
+                    'sbox': sbox,
+                    'matrix': matrix
+                })
+
+    if not cleaned_results:
+        raise ValueError('No valid S-box data found')
+
+    # Semua S-box dievaluasi sekaligus (batch kernel)
+    server_metrics = _sbox_metrics_batch([r['sbox'] for r in cleaned_results])
+    for r, client, server in zip(cleaned_results, client_metrics, server_metrics):
+        r['metrics'] = {**client, **server}
+    if progress is not None:
+        progress(0.5)
+
+    # Create workbook
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    wb = Workbook()
+    ws_summary = wb.active
+    ws_summary.title = 'Summary'
+
+    # Header row
+    ws_summary.append(['Matrix', 'Bijective', 'Balanced', 'NL', 'SAC', 'BIC-NL', 'BIC-SAC', 'LAP', 'DAP', 'DU', 'ALG-DEG', 'TG', 'Score'])
+
+    # Style header
+    header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF')
+    for cell in ws_summary[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+
+    # Add data rows
+    for result in cleaned_results:
+        metrics = result.get('metrics', {})
+        score = batch_score(metrics)
+
+        ws_summary.append([
+            result.get('name', ''),
+            'Yes' if metrics.get('bijective') else 'No',
+            'Yes' if metrics.get('balanced') else 'No',
+            int(metrics.get('nl', 0) or 0),
+            round(float(metrics.get('sac', 0) or 0), 4),
+            int(metrics.get('bic_nl', 0) or 0),
+            round(float(metrics.get('bic_sac', 0) or 0), 4),
+            int(metrics.get('lap', 0) or 0),
+            round(float(metrics.get('dap_prob', 0) or 0), 4),
+            int(metrics.get('du', 0) or 0),
+            int(metrics.get('alg_deg', 0) or 0),
+            round(float(metrics.get('tg', 0) or 0), 4),
+            round(score, 2)
+        ])
+
+    # Adjust column widths
+    ws_summary.column_dimensions['A'].width = 20
+    for col in ['B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']:
+        ws_summary.column_dimensions[col].width = 12
+
+    # Sheet 2: S-boxes (16x16 matrices)
+    ws_sboxes = wb.create_sheet('S-Boxes')
+    row = 1
+    for result in cleaned_results:
+        sbox = result.get('sbox', [])
+        if sbox:
+            # Add label
+            ws_sboxes[f'A{row}'] = result.get('name', '')
+            ws_sboxes[f'A{row}'].font = Font(bold=True)
+            row += 1
+
+            # Add 16x16 matrix
+            for i in range(16):
+                for j in range(16):
+                    idx = i * 16 + j
+                    if idx < len(sbox):
+                        cell = ws_sboxes.cell(row=row+i, column=j+1)
+                        cell.value = int(sbox[idx])
+                        cell.alignment = Alignment(horizontal='center')
+
+            row += 17  # 16 rows + 1 blank row
+
+    # Sheet 3: Matrices (affine transformation matrices)
+    ws_matrices = wb.create_sheet('Matrices')
+    row = 1
+    for result in cleaned_results:
+        matrix = result.get('matrix', [])
+        if matrix and len(matrix) > 0:
+            # Add label
+            ws_matrices[f'A{row}'] = result.get('name', '')
+            ws_matrices[f'A{row}'].font = Font(bold=True)
+            row += 1
+
+            # Add matrix (usually 8x8)
+            for i in range(len(matrix)):
+                if isinstance(matrix[i], list):
+                    for j in range(len(matrix[i])):
+                        cell = ws_matrices.cell(row=row+i, column=j+1)
+                        try:
+                            cell.value = int(matrix[i][j])
+                        except (ValueError, TypeError):
+                            cell.value = matrix[i][j]
+                        cell.alignment = Alignment(horizontal='center')
+
+            row += len(matrix) + 1
+
+    # Save file
+    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'batch_analysis_{ts}.xlsx'
+    filepath = os.path.join(GENERATED_FOLDER, filename)
+
+    print(f'Saving Excel to: {filepath}')
+    wb.save(filepath)
+    print(f'Excel saved successfully')
+    return filepath
+
+
 @app.route('/api/batch-export-excel', methods=['POST'])
 def api_batch_export_excel():
     """Export batch analysis results to Excel"""
     try:
         results = request.get_json() or []
-        if not results:
-            return jsonify({'error': 'No results to export'}), 400
-        
-        # Validate and clean data
-        cleaned_results = []
-        for result in results:
-            if isinstance(result, dict):
-                # Extract sbox (should be a list of 256 ints)
-                sbox = result.get('sbox', [])
-                if isinstance(sbox, list) and len(sbox) == 256:
-                    # Convert to ints if they're not already
-                    try:
-                        sbox = [int(x) for x in sbox]
-                    except (ValueError, TypeError):
-                        continue
-                    
-                    # Extract matrix (should be list of lists)
-                    matrix = result.get('matrix', [])
-                    if not isinstance(matrix, list):
-                        matrix = []
-                    
-                    cleaned_results.append({
-                        'name': result.get('name', 'Unknown'),
-                        'sbox': sbox,
-                        'matrix': matrix,
-                        'metrics': result.get('metrics', {})
-                    })
-        
-        if not cleaned_results:
-            return jsonify({'error': 'No valid S-box data found'}), 400
-        
-        # Create workbook
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Alignment
-        
-        wb = Workbook()
-        ws_summary = wb.active
-        ws_summary.title = 'Summary'
-        
-        # Header row
-        ws_summary.append(['Matrix', 'Bijective', 'Balanced', 'NL', 'SAC', 'BIC-NL', 'BIC-SAC', 'LAP', 'DAP', 'DU', 'ALG-DEG', 'TG', 'Score'])
-        
-        # Style header
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        header_font = Font(bold=True, color='FFFFFF')
-        for cell in ws_summary[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-        
-        # Helper function to calculate score
-        def calc_score(metrics):
-            try:
-                if not isinstance(metrics, dict):
-                    return 0
-                nl = float(metrics.get('nl', 0) or 0) / 112.0
-                sac = float(metrics.get('sac', 0) or 0) / 0.5
-                bic_nl = float(metrics.get('bic_nl', 0) or 0) / 112.0
-                du_val = float(metrics.get('du', 1) or 1)
-                du = 1.0 / (1.0 + du_val)
-                tg = float(metrics.get('tg', 0) or 0) / 0.5
-                score = (nl * 0.3 + sac * 0.2 + bic_nl * 0.2 + du * 0.15 + tg * 0.15) * 100
-                return max(0, min(100, score))  # Clamp to 0-100
-            except:
-                return 0
-        
-        # Add data rows
-        for result in cleaned_results:
-            metrics = result.get('metrics', {})
-            score = calc_score(metrics)
-            
-            ws_summary.append([
-                result.get('name', ''),
-                'Yes' if metrics.get('bijective') else 'No',
-                'Yes' if metrics.get('balanced') else 'No',
-                int(metrics.get('nl', 0) or 0),
-                round(float(metrics.get('sac', 0) or 0), 4),
-                int(metrics.get('bic_nl', 0) or 0),
-                round(float(metrics.get('bic_sac', 0) or 0), 4),
-                int(metrics.get('lap', 0) or 0),
-                round(float(metrics.get('dap_prob', 0) or 0), 4),
-                int(metrics.get('du', 0) or 0),
-                int(metrics.get('alg_deg', 0) or 0),
-                round(float(metrics.get('tg', 0) or 0), 4),
-                round(score, 2)
-            ])
-        
-        # Adjust column widths
-        ws_summary.column_dimensions['A'].width = 20
-        for col in ['B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M']:
-            ws_summary.column_dimensions[col].width = 12
-        
-        # Sheet 2: S-boxes (16x16 matrices)
-        ws_sboxes = wb.create_sheet('S-Boxes')
-        row = 1
-        for result in cleaned_results:
-            sbox = result.get('sbox', [])
-            if sbox:
-                # Add label
-                ws_sboxes[f'A{row}'] = result.get('name', '')
-                ws_sboxes[f'A{row}'].font = Font(bold=True)
-                row += 1
-                
-                # Add 16x16 matrix
-                for i in range(16):
-                    for j in range(16):
-                        idx = i * 16 + j
-                        if idx < len(sbox):
-                            cell = ws_sboxes.cell(row=row+i, column=j+1)
-                            cell.value = int(sbox[idx])
-                            cell.alignment = Alignment(horizontal='center')
-                
-                row += 17  # 16 rows + 1 blank row
-        
-        # Sheet 3: Matrices (affine transformation matrices)
-        ws_matrices = wb.create_sheet('Matrices')
-        row = 1
-        for result in cleaned_results:
-            matrix = result.get('matrix', [])
-            if matrix and len(matrix) > 0:
-                # Add label
-                ws_matrices[f'A{row}'] = result.get('name', '')
-                ws_matrices[f'A{row}'].font = Font(bold=True)
-                row += 1
-                
-                # Add matrix (usually 8x8)
-                for i in range(len(matrix)):
-                    if isinstance(matrix[i], list):
-                        for j in range(len(matrix[i])):
-                            cell = ws_matrices.cell(row=row+i, column=j+1)
-                            try:
-                                cell.value = int(matrix[i][j])
-                            except (ValueError, TypeError):
-                                cell.value = matrix[i][j]
-                            cell.alignment = Alignment(horizontal='center')
-                
-                row += len(matrix) + 1
-        
-        # Save file
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'batch_analysis_{ts}.xlsx'
-        filepath = os.path.join(GENERATED_FOLDER, filename)
-        
-        print(f'Saving Excel to: {filepath}')
-        wb.save(filepath)
-        print(f'Excel saved successfully')
+        try:
+            filepath = _batch_export_workbook(results)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        filename = os.path.basename(filepath)
         
         # Return file as response
         return send_file(filepath, 
@@ -1040,59 +1204,314 @@ def api_aes_decrypt_image():
     })
 
 
+def _explorer_summary(r):
+    """Kandidat explorer tanpa array sbox lengkap"""
+    return {
+        'id': r.get('id'),
+        'hash': r.get('hash'),
+        'poly': r['poly'],
+        'bijective': r['bijective'],
+        'balanced': r['balanced'],
+        'sac': r['sac'],
+        'sac_value': r['sac_value'],
+        'sac_dist_max': r['sac_dist_max'],
+        'diff_uniformity': r['diff_uniformity'],
+        'nonlinearity': r['nonlinearity'],
+        'bic_nl': r['bic_nl'],
+        'bic_sac': r['bic_sac'],
+        'alg_deg': r['alg_deg'],
+        'transparency_order': r['transparency_order'],
+        'boomerang_uniformity': r['boomerang_uniformity'],
+        'fixed_points': r['fixed_points'],
+        'opposite_fixed_points': r['opposite_fixed_points'],
+        'free_constants': r['free_constants'],
+        'matrix': r['matrix'],
+        'constant': r['constant']
+    }
+
+
+def _explorer_run(params, top_k, compute):
+    """
+    Jalankan compute() -> (meta, results), atau ambil dari candidate store jika
+    run deterministik dengan params yang sama sudah pernah dihitung. params None
+    berarti run tidak deterministik; params['seed'] None berarti seed acak.
+    Keduanya tidak dicari maupun disimpan sebagai run (lihat _store_run).
+    """
+    if params is not None and params.get('seed', 0) is not None:
+        cached = candidate_store.load_run(candidate_store.run_key(params), top_k)
+        if cached is not None:
+            return {**cached[0], 'cached': True}, cached[1]
+    meta, results = compute()
+    _store_run(params, top_k, meta, results)
+    return {**meta, 'cached': False}, results
+
+
+def _store_run(params, top_k, meta, results):
+    """
+    Simpan kandidat hasil run ke candidate store dan set field 'hash' tiap result.
+    Hanya run deterministik (params dengan seed) yang dicatat di tabel runs,
+    karena run dengan seed acak tidak akan pernah diminta lagi dengan key yang sama.
+    """
+    if params is not None and params.get('seed', 0) is not None:
+        hashes = candidate_store.save_run(candidate_store.run_key(params), top_k, meta, results,
+                                          _random_run_prefix(params))
+    else:
+        hashes = candidate_store.save_candidates(results, meta['strategy'])
+    for r, h in zip(results, hashes):
+        r['hash'] = h
+
+
+def _random_run_params(n_candidates, seed, workers, poly_label, thresholds):
+    """Key run random sampling; stream (satu shard) sama dengan workers=1"""
+    return {'strategy': 'random', 'n': n_candidates, 'seed': seed, 'workers': workers,
+            'poly': poly_label, 'thresholds': thresholds}
+
+
+def _random_run_prefix(params):
+    """
+    (base key tanpa n, n) untuk run random ber-seed dengan workers=1: kandidatnya
+    prefix dari run yang lebih besar, jadi bisa dilanjutkan run berikutnya. None jika tidak.
+    """
+    if params is None or params.get('strategy') != 'random' or params['seed'] is None or params['workers'] != 1:
+        return None
+    return candidate_store.run_key({k: v for k, v in params.items() if k != 'n'}), params['n']
+
+
+def _random_run_meta(tested, passed, seed, workers, poly_label, thresholds, pruned):
+    return {
+        'strategy': 'random',
+        'total_tested': tested,
+        'total_passed': passed,
+        'seed': seed,
+        'workers': workers,
+        'poly': poly_label,
+        'thresholds': thresholds,
+        'pruned': pruned,
+    }
+
+
 @app.route('/api/explore-matrices', methods=['GET'])
 def api_explore_matrices():
-    """Explore multiple affine matrix candidates dan return ranked results"""
-    n_candidates = request.args.get('n', default=50, type=int)
-    top_n = request.args.get('top', default=10, type=int)
-    seed = request.args.get('seed', default=None, type=int)
+    """
+    Explore multiple affine matrix candidates dan return ranked results.
+    Threshold opsional (mis. ?min_nl=112&max_du=4&sac_tol=0.01) membuang kandidat
+    sedini mungkin; jumlah yang dibuang per threshold ada di 'pruned'.
+    strategy=hill|anneal menjalankan local search (objective, iterations, time_limit)
+    sebagai ganti random sampling; strategy=family&family=circulant|toeplitz|companion|involutory
+    meng-enumerasi seluruh family (all=true untuk semua kandidat yang lolos).
+    poly=<hex> memilih polynomial (default 11B); poly=all (khusus strategy random)
+    mencari di gabungan 30 polynomial, polynomial tiap kandidat ada di field 'poly'.
+    Hasil disimpan di candidate store; run dengan parameter + seed yang sama
+    diambil dari store ('cached': true). Run random ber-seed dengan workers=1
+    melanjutkan run tersimpan terbesar dengan n lebih kecil (jumlahnya di
+    'reused'); run yang lebih kecil dari run tersimpan tetap dihitung ulang
+    karena store hanya menyimpan top-k. Random sampling dengan n > EXPLORE_SYNC_MAX
+    dijalankan sebagai job explore: return 202 dengan id dan link job.
+    """
+    if request.args.get('strategy', 'random') == 'random' and \
+            request.args.get('n', default=50, type=int) > EXPLORE_SYNC_MAX:
+        # Terlalu lama untuk satu request (timeout worker) -> jalankan sebagai job
+        try:
+            parse_thresholds(request.args, EXPLORER_THRESHOLDS)
+            parse_polys(request.args.get('poly'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        job_id = job_queue.submit('explore', request.args.to_dict())
+        return jsonify({'job_id': job_id, 'kind': 'explore', 'status': 'queued', **_job_links(job_id)}), 202
+    payload, status = _explore_matrices(request.args)
+    return jsonify(payload), status
+
+
+def _arg(args, key, default=None, type=None):
+    """Ambil parameter dari request.args atau dict biasa (params job)"""
+    if hasattr(args, 'getlist'):
+        return args.get(key, default=default, type=type)
+    value = args.get(key, default)
+    if value is None or type is None:
+        return value
+    try:
+        return type(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# Batas n explorer random: request biasa harus selesai jauh di bawah timeout
+# worker gunicorn (~0.4 ms per kandidat per core); stream butuh worker gthread
+EXPLORE_SYNC_MAX = 10000
+EXPLORE_STREAM_MAX = 1000000
+EXPLORE_MAX_WORKERS = 64  # partisi shard explorer random
+
+
+def _explore_matrices(args, max_candidates=EXPLORE_SYNC_MAX, progress=None):
+    """
+    Isi /api/explore-matrices untuk args (request.args atau dict params job).
+    progress(fraksi) opsional dipanggil selama random sampling.
+    Return (payload JSON, HTTP status).
+    """
+    n_candidates = _arg(args, 'n', 50, int)
+    top_n = _arg(args, 'top', 10, int)
+    seed = _arg(args, 'seed', None, int)
+    workers = _arg(args, 'workers', 1, int)
+    strategy = _arg(args, 'strategy', 'random')
+    poly = _arg(args, 'poly')
+    try:
+        thresholds = parse_thresholds(args, EXPLORER_THRESHOLDS)
+        polys = parse_polys(poly)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if len(polys) > 1 and strategy != 'random':
+        return {'error': 'poly=all hanya didukung untuk strategy random'}, 400
+    poly_label = 'all' if len(polys) > 1 else format_poly(polys[0])
+    top_n = max(1, min(top_n, 50))
     
-    # Limit untuk prevent overload
-    if n_candidates > 200:
-        n_candidates = 200
-    if top_n > 50:
-        top_n = 50
+    if strategy in STRATEGIES:
+        objective = _arg(args, 'objective', 'to')
+        iterations = min(_arg(args, 'iterations', 5000, int), 200000)
+        time_limit = _arg(args, 'time_limit', None, float)
+        if time_limit is not None:
+            time_limit = min(time_limit, 60.0)
+        top_k = top_n
+        # Dengan time_limit hasil bergantung pada kecepatan mesin -> tidak di-cache
+        params = None if time_limit is not None else {
+            'strategy': strategy, 'objective': objective, 'iterations': iterations, 'seed': seed,
+            'poly': poly_label, 'thresholds': thresholds, 'top_k': top_k}
+        
+        def compute():
+            searched = local_search(strategy, objective, iterations=iterations, time_limit=time_limit,
+                                    seed=seed, poly=polys[0], top_k=top_k, thresholds=thresholds)
+            meta = {key: searched[key] for key in ('objective', 'iterations', 'accepted', 'restarts',
+                                                   'elapsed', 'seed', 'start_score', 'best_score')}
+            return {'strategy': strategy, **meta, 'poly': poly_label, 'thresholds': thresholds}, searched['results']
+    elif strategy == 'family':
+        family = _arg(args, 'family', 'circulant')
+        if family not in FAMILIES:
+            return {'error': f"Family matriks tidak dikenal: {family}"}, 400
+        top_k = None if str(_arg(args, 'all', 'false')).lower() == 'true' else top_n
+        params = {'strategy': strategy, 'family': family, 'poly': poly_label, 'thresholds': thresholds}
+        
+        def compute():
+            enumerated = explore_family(family, poly=polys[0], thresholds=thresholds, top_k=top_k)
+            return {'strategy': strategy, 'family': family, 'poly': poly_label,
+                    'stats': enumerated['stats'], 'thresholds': thresholds,
+                    'pruned': enumerated['pruned']}, enumerated['results']
+    elif strategy == 'random':
+        # Limit untuk prevent overload. workers = jumlah partisi (bagian dari hasil dan
+        # key run, sama di host mana pun); pool process saja yang dibatasi jumlah core
+        n_candidates = min(n_candidates, max_candidates)
+        workers = max(1, min(workers, EXPLORE_MAX_WORKERS))
+        top_k = top_n
+        params = _random_run_params(n_candidates, seed, workers, poly_label, thresholds)
+        tested = [0]
+        
+        def report(count):
+            tested[0] += count
+            progress(tested[0] / max(n_candidates, 1))
+        
+        def compute():
+            # Run ber-seed workers=1 yang lebih kecil tersimpan: lanjutkan dari sana,
+            # hanya kandidat sisanya yang dievaluasi
+            prefix = _random_run_prefix(params)
+            prior = candidate_store.load_prefix_run(*prefix, top_k) if prefix else None
+            skip = prior[0] if prior else 0
+            tested[0] = skip
+            # Hanya top_n yang disimpan per worker; hasil sama untuk (seed, workers) yang sama
+            explored = explore_affine(n_candidates=n_candidates, seed=seed, poly=poly, thresholds=thresholds,
+                                      workers=workers, top_k=top_k, progress=report if progress else None,
+                                      max_procs=os.cpu_count() or 1, skip=skip)
+            results, passed, pruned = explored['results'], explored['passed'], explored['pruned']
+            if prior:
+                _, prior_meta, prior_results = prior
+                results = merge_top(prior_results, results, top_k)
+                passed += prior_meta['total_passed']
+                pruned = {key: pruned.get(key, 0) + prior_meta['pruned'].get(key, 0)
+                          for key in {*pruned, *prior_meta['pruned']}}
+            meta = _random_run_meta(n_candidates, passed, explored['seed'], workers, explored['poly'],
+                                    thresholds, pruned)
+            if prior:
+                meta['reused'] = skip  # jumlah kandidat yang diambil dari run tersimpan
+            return meta, get_top_candidates(results, top_n=top_k)
+    else:
+        return {'error': f"Strategy tidak dikenal: {strategy}"}, 400
     
-    results = explore_affine_candidates(n_candidates=n_candidates, seed=seed)
-    top_results = get_top_candidates(results, top_n=top_n)
+    try:
+        meta, results = _explorer_run(params, top_k, compute)
+    except ValueError as e:
+        return {'error': str(e)}, 400
     
     # Simplify output (remove full sbox array for brevity)
-    simplified = []
-    for r in top_results:
-        simplified.append({
-            'id': r['id'],
-            'bijective': r['bijective'],
-            'balanced': r['balanced'],
-            'sac': r['sac'],
-            'diff_uniformity': r['diff_uniformity'],
-            'nonlinearity': r['nonlinearity'],
-            'matrix': r['matrix'],
-            'constant': r['constant']
-        })
+    candidates = [_explorer_summary(r) for r in results]
+    if strategy in STRATEGIES:
+        for c, r in zip(candidates, results):
+            c['objective_score'] = r['objective_score']
+    return {**meta, 'top_n': top_n, 'candidates': candidates}, 200
+
+
+@app.route('/api/explore-matrices/stream', methods=['GET'])
+def api_explore_matrices_stream():
+    """
+    Versi streaming /api/explore-matrices (NDJSON, satu event JSON per baris).
+    Event: start -> progress (tiap chunk; 'best' saat top-k berubah) -> done.
+    Hanya top-k yang disimpan server, jadi n boleh jauh lebih besar. Top-k akhir
+    disimpan di candidate store (dengan seed juga sebagai run explorer workers=1).
+    """
+    n_candidates = request.args.get('n', default=1000, type=int)
+    top_n = request.args.get('top', default=10, type=int)
+    seed = request.args.get('seed', default=None, type=int)
+    poly = request.args.get('poly', default=None)
+    try:
+        thresholds = parse_thresholds(request.args, EXPLORER_THRESHOLDS)
+        polys = parse_polys(poly)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'total_tested': n_candidates,
-        'top_n': top_n,
-        'candidates': simplified
-    })
+    n_candidates = min(n_candidates, EXPLORE_STREAM_MAX)
+    top_n = max(1, min(top_n, 50))
+    poly_label = 'all' if len(polys) > 1 else format_poly(polys[0])
+    
+    def generate():
+        for event in explore_affine_stream(n_candidates, seed=seed, poly=poly, thresholds=thresholds, top_k=top_n):
+            if event['event'] == 'done':
+                meta = _random_run_meta(event['tested'], event['passed'], event['seed'], 1, poly_label,
+                                        thresholds, event['pruned'])
+                _store_run(_random_run_params(n_candidates, seed, 1, poly_label, thresholds), top_n, meta,
+                           event['results'])
+            for key in ('best', 'results'):
+                if key in event:
+                    event[key] = [_explorer_summary(r) for r in event[key]]
+            yield json.dumps(event) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/api/download-candidate/<int:candidate_id>', methods=['POST'])
 def api_download_candidate(candidate_id):
-    """Generate & download specific candidate S-Box as Excel"""
+    """
+    Generate & download specific candidate S-Box as Excel.
+    Jika body berisi 'hash' kandidat tersimpan, S-box diambil dari candidate store.
+    """
     data = request.get_json()
+    stored = candidate_store.get_candidate(data['hash']) if data.get('hash') else None
+    if stored is not None:
+        path = export_sbox_to_excel(stored['sbox'], filename=f"candidate_{candidate_id}.xlsx")
+        return send_file(path, as_attachment=True, download_name=os.path.basename(path))
     matrix = data.get('matrix')
     constant = data.get('constant')
+    poly = data.get('poly')
     
     if not matrix or not constant:
         return jsonify({"error": "Matrix and constant required"}), 400
+    try:
+        poly = parse_poly(poly)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     import numpy as np
     from core.matrix_explorer import generate_sbox_from_affine
     
     M = np.array(matrix, dtype=int)
     C = np.array(constant, dtype=int)
-    sbox = generate_sbox_from_affine(M, C)
+    sbox = generate_sbox_from_affine(M, C, poly)
     
     fname = f"candidate_{candidate_id}.xlsx"
     path = export_sbox_to_excel(sbox, filename=fname)
@@ -1100,6 +1519,188 @@ def api_download_candidate(candidate_id):
     return send_file(path, as_attachment=True, download_name=fname)
 
 
+@app.route('/api/candidates', methods=['GET'])
+def api_query_candidates():
+    """
+    Query kandidat tersimpan dengan threshold explorer, mis.
+    ?min_nl=112&max_du=4&order=sac_dist_max&limit=20&offset=40.
+    order: rank (default) atau nama kolom metric (desc=true untuk menurun); poly=<hex> opsional.
+    """
+    limit = max(1, min(request.args.get('limit', default=50, type=int), 500))
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+    order = request.args.get('order', default='rank')
+    descending = request.args.get('desc', default='false').lower() == 'true'
+    poly = request.args.get('poly', default=None)
+    try:
+        thresholds = parse_thresholds(request.args, EXPLORER_THRESHOLDS)
+        total, records = candidate_store.query_candidates(
+            thresholds, order, descending, limit, offset, parse_poly(poly) if poly else None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'total': total,
+        'limit': limit,
+        'offset': offset,
+        'order': order,
+        'thresholds': thresholds,
+        'candidates': [{**_explorer_summary(r), 'seen': r['seen'], 'source': r['source']} for r in records]
+    })
+
+
+@app.route('/api/candidates/<candidate_hash>', methods=['GET'])
+def api_get_candidate(candidate_hash):
+    """Kandidat tersimpan lengkap (termasuk S-box) berdasarkan hash"""
+    record = candidate_store.get_candidate(candidate_hash)
+    if record is None:
+        return jsonify({'error': 'Kandidat tidak ditemukan'}), 404
+    return jsonify(record)
+
+
+@app.route('/api/candidates/<candidate_hash>/download', methods=['GET'])
+def api_download_stored_candidate(candidate_hash):
+    """Download S-box kandidat tersimpan sebagai Excel (lookup satu row)"""
+    record = candidate_store.get_candidate(candidate_hash)
+    if record is None:
+        return jsonify({'error': 'Kandidat tidak ditemukan'}), 404
+    path = export_sbox_to_excel(record['sbox'], filename=f"candidate_{candidate_hash[:12]}.xlsx")
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+
+
+# ---------------------------------------------------------------------------
+# Background jobs: explorer, batch export dan analyze di luar request
+# ---------------------------------------------------------------------------
+
+JOB_MAX_CANDIDATES = 10000000  # batas n explorer untuk job (request biasa: EXPLORE_SYNC_MAX)
+
+
+@job_queue.job_handler('explore')
+def _explore_job(params, job):
+    payload, status = _explore_matrices(params, JOB_MAX_CANDIDATES, job.progress)
+    if status != 200:
+        raise ValueError(payload['error'])
+    return payload
+
+
+@job_queue.job_handler('batch_export')
+def _batch_export_job(params, job):
+    filepath = _batch_export_workbook(params.get('results') or [], job.progress)
+    return {'filename': os.path.basename(filepath)}
+
+
+@job_queue.job_handler('analyze')
+def _analyze_job(params, job):
+    sbox_path = os.path.join(UPLOAD_FOLDER, secure_filename(params.get('sbox_file') or ''))
+    img_name = secure_filename(params['sample_img']) if params.get('sample_img') else None
+    return _analyze_report(sbox_path, img_name, job.progress)
+
+
+def start_job_workers(debug=False):
+    """
+    Jalankan worker job queue saat server start (app.run atau hook gunicorn
+    post_worker_init). Dengan reloader debug hanya di proses child yang melayani request.
+    """
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        job_queue.start_workers()
+
+
+def _job_links(job_id):
+    return {
+        'status_url': url_for('api_job_status', job_id=job_id),
+        'result_url': url_for('api_job_result', job_id=job_id),
+        'cancel_url': url_for('api_job_cancel', job_id=job_id),
+    }
+
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """
+    Submit job background; return 202 dengan id job.
+    JSON: {"kind": "explore", "params": {parameter /api/explore-matrices}} atau
+    {"kind": "batch_export", "params": {"results": [...]}}. Analyze memakai
+    multipart seperti /api/analyze (file sbox, sample_img opsional, kind=analyze).
+    """
+    if request.files:
+        kind = request.form.get('kind', 'analyze')
+        if kind != 'analyze':
+            return jsonify({'error': 'Upload file hanya untuk job analyze'}), 400
+        sbox_file = request.files.get('sbox')
+        if sbox_file is None or sbox_file.filename == '':
+            return jsonify({'error': 'File S-box tidak ditemukan'}), 400
+        if not allowed_file(sbox_file.filename, ALLOWED_SBOX):
+            return jsonify({'error': 'Format file harus .xlsx, .xls, .csv, .txt, atau .json'}), 400
+        # Nama file diawali id job supaya upload job lain dengan nama sama tidak menimpa
+        job_id = job_queue.new_job_id()
+        sbox_fname = f"{job_id}_{secure_filename(sbox_file.filename)}"
+        sbox_file.save(os.path.join(UPLOAD_FOLDER, sbox_fname))
+        params = {'sbox_file': sbox_fname,
+                  'sample_img': _save_sample_image(request.files.get('sample_img'), prefix=f"{job_id}_")}
+    else:
+        job_id = None
+        data = request.get_json(silent=True) or {}
+        kind = data.get('kind')
+        params = data.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params harus object JSON'}), 400
+    
+    try:
+        if kind == 'explore':  # validasi parameter sebelum masuk antrian
+            parse_thresholds(params, EXPLORER_THRESHOLDS)
+            parse_polys(params.get('poly'))
+        job_id = job_queue.submit(kind, params, job_id=job_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'job_id': job_id, 'kind': kind, 'status': 'queued', **_job_links(job_id)}), 202
+
+
+@app.route('/api/jobs', methods=['GET'])
+def api_list_jobs():
+    """Daftar job terbaru (?status=queued|running|done|failed|cancelled&limit=50)"""
+    limit = max(1, min(request.args.get('limit', default=50, type=int), 500))
+    try:
+        jobs = job_queue.list_jobs(request.args.get('status'), limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'jobs': jobs})
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """Status + progress (0..1) satu job"""
+    job = job_queue.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    return jsonify({**job, **_job_links(job_id)})
+
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def api_job_result(job_id):
+    """Hasil job yang selesai; 202 jika masih berjalan, 409 jika gagal/dibatalkan"""
+    job = job_queue.get_job(job_id, with_result=True)
+    if job is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    if job['status'] in ('queued', 'running'):
+        return jsonify({'job_id': job_id, 'status': job['status'], 'progress': job['progress']}), 202
+    if job['status'] != 'done':
+        return jsonify({'job_id': job_id, 'status': job['status'], 'error': job['error']}), 409
+    
+    result = job['result']
+    if job['kind'] == 'batch_export':
+        result = {**result, 'download_url': url_for('generated_file', filename=result['filename'])}
+    return jsonify({'job_id': job_id, 'kind': job['kind'], 'status': 'done', 'result': result})
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def api_job_cancel(job_id):
+    """Batalkan job (queued langsung batal, running berhenti di checkpoint progress berikutnya)"""
+    status = job_queue.cancel(job_id)
+    if status is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    return jsonify({'job_id': job_id, 'status': status, 'cancel_requested': status in ('running', 'cancelled')})
+
+
 if __name__ == "__main__":
+    start_job_workers(debug=True)
     app.run(debug=True, port=5000)
 
@@ -17,21 +17,48 @@ C = np.array([1,0,0,0,1,0,0,1], dtype=int)  # 0x89 (137)
 
 
 
+C_BYTE = int((C << np.arange(8)).sum())  # C dalam representasi byte (bit i = C[i])
+
+
+def bits_to_byte(bits):
+    """Vector bit 0/1 (bit i = LSB ke-i), atau batch (N,8), -> byte"""
+    bits = np.asarray(bits, dtype=np.int64)
+    return (bits << np.arange(8)).sum(axis=-1)
+
+
+def affine_map(values, matrix, constant=0):
+    """
+    Affine engine: y = M·x XOR c untuk seluruh array byte sekaligus.
+    unpackbits -> matmul mod 2 -> packbits, tanpa loop per byte.
+    """
+    values = np.asarray(values, dtype=np.uint8)
+    return affine_map_batch(values, np.asarray(matrix)[None], [constant])[0]
+
+
+def affine_map_batch(values, matrices, constants):
+    """
+    Terapkan N matriks (N,8,8) + N konstanta byte ke array byte yang sama.
+    Return array uint8 shape (N, len(values)); dengan values = tabel inverse
+    hasilnya langsung tensor S-box N x 256.
+    """
+    values = np.asarray(values, dtype=np.uint8)
+    matrices = np.asarray(matrices, dtype=np.float32).reshape(-1, 8, 8)
+    constants = np.asarray(constants, dtype=np.uint8).reshape(-1)
+    n = matrices.shape[0]
+
+    flat = values.reshape(-1)
+    bits = np.unpackbits(flat[:, None], axis=1, bitorder='little').astype(np.float32)  # (V,8)
+    # Satu matmul untuk semua matriks: (V,8) @ (8, N*8) -> (V, N*8)
+    out_bits = (bits @ matrices.reshape(n * 8, 8).T).astype(np.uint8) & 1
+    out_bits = out_bits.reshape(flat.size, n, 8).transpose(1, 0, 2)
+    out = np.packbits(out_bits, axis=2, bitorder='little')[..., 0]
+    return (out ^ constants[:, None]).reshape((n,) + values.shape)
+
+
 def affine_transform(byte):
-    bits = np.array([(byte >> i) & 1 for i in range(8)], dtype=int)
-    mul = (AES_MATRIX.dot(bits) % 2 + C) % 2
-    out = 0
-    for i in range(8):
-        out |= (mul[i] << i)
-    return out
+    return int(affine_map([byte], AES_MATRIX, C_BYTE)[0])
 
 
 def affine_transform_custom(byte, matrix, constant):
     """Apply affine transformation with custom matrix and constant"""
-    bits = np.array([(byte >> i) & 1 for i in range(8)], dtype=int)
-    const_bits = np.array([(constant >> i) & 1 for i in range(8)], dtype=int)
-    mul = (matrix.dot(bits) % 2 + const_bits) % 2
-    out = 0
-    for i in range(8):
-        out |= (mul[i] << i)
-    return out
+    return int(affine_map([byte], matrix, constant)[0])
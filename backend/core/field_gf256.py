@@ -1,7 +1,19 @@
 # operasi GF(2^8) untuk mencari inverse multiplikatif
+from functools import lru_cache
+
+import numpy as np
+
 IRREDUCIBLE_POLY = 0x11B  # polynomial AES (default)
 
-def gf_mul(a, b):
+# Registry semua 30 polynomial irreducible derajat 8 (bit 8 = x^8)
+IRREDUCIBLE_POLYS = (
+    0x11B, 0x11D, 0x12B, 0x12D, 0x139, 0x13F, 0x14D, 0x15F, 0x163, 0x165,
+    0x169, 0x171, 0x177, 0x17B, 0x187, 0x18B, 0x18D, 0x19F, 0x1A3, 0x1A9,
+    0x1B1, 0x1BD, 0x1C3, 0x1CF, 0x1D7, 0x1DD, 0x1E7, 0x1F3, 0x1F5, 0x1F9,
+)
+
+
+def gf_mul(a, b, poly=IRREDUCIBLE_POLY):
     result = 0
     for _ in range(8):
         if b & 1:
@@ -9,15 +21,97 @@ def gf_mul(a, b):
         hi = a & 0x80
         a <<= 1
         if hi:
-            a ^= IRREDUCIBLE_POLY
+            a ^= poly
         a &= 0xFF
         b >>= 1
     return result
 
-def gf_inverse(x):
-    if x == 0:
-        return 0
-    for y in range(1, 256):
-        if gf_mul(x, y) == 1:
-            return y
-    return 0
+
+def parse_poly(poly):
+    """Normalize polynomial (int atau hex string seperti '11B'/'0x11b') dan cek registry"""
+    if poly is None:
+        return IRREDUCIBLE_POLY
+    if isinstance(poly, str):
+        try:
+            poly = int(poly, 16)
+        except ValueError:
+            raise ValueError(f"Polynomial '{poly}' bukan hex yang valid")
+    poly = int(poly)
+    if poly not in IRREDUCIBLE_POLYS:
+        raise ValueError(f"Polynomial 0x{poly:X} bukan polynomial irreducible derajat 8")
+    return poly
+
+
+def parse_polys(poly):
+    """Seperti parse_poly, tetapi 'all' berarti semua polynomial registry; return tuple"""
+    if isinstance(poly, str) and poly.strip().lower() == 'all':
+        return IRREDUCIBLE_POLYS
+    return (parse_poly(poly),)
+
+
+def format_poly(poly):
+    """Polynomial sebagai hex string, mis. '0x11B'"""
+    return f"0x{parse_poly(poly):X}"
+
+
+def field_tables(poly=IRREDUCIBLE_POLY):
+    """
+    Tabel (exp, log, inv) untuk GF(2^8) dengan polynomial tertentu.
+    Dibangun sekali per polynomial lalu di-cache; array read-only.
+
+    exp punya panjang 510 supaya exp[log[a] + log[b]] tidak perlu mod 255.
+    """
+    return _build_tables(parse_poly(poly))
+
+
+@lru_cache(maxsize=None)
+def _build_tables(poly):
+    # Cari generator (elemen primitif) - tidak semua polynomial punya x sebagai generator
+    for g in range(2, 256):
+        exp = [1]
+        for _ in range(254):
+            exp.append(gf_mul(exp[-1], g, poly))
+        if len(set(exp)) == 255:
+            break
+
+    exp = np.array(exp + exp, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int32)
+    log[exp[:255]] = np.arange(255, dtype=np.int32)
+
+    inv = np.zeros(256, dtype=np.uint8)
+    inv[1:] = exp[(255 - log[1:]) % 255]
+
+    for table in (exp, log, inv):
+        table.setflags(write=False)
+    return exp, log, inv
+
+
+def inverse_table(poly=IRREDUCIBLE_POLY):
+    """Tabel inverse multiplikatif 256 entry (0 -> 0)"""
+    return field_tables(poly)[2]
+
+
+@lru_cache(maxsize=None)
+def all_inverse_tables():
+    """Tabel inverse semua polynomial registry (30, 256), urutan IRREDUCIBLE_POLYS; read-only"""
+    tables = np.stack([inverse_table(p) for p in IRREDUCIBLE_POLYS])
+    tables.setflags(write=False)
+    return tables
+
+
+def mul(a, b, poly=IRREDUCIBLE_POLY):
+    """Perkalian GF(2^8) vectorized atas array NumPy (via log/antilog)"""
+    exp, log, _ = field_tables(poly)
+    a = np.asarray(a, dtype=np.uint8)
+    b = np.asarray(b, dtype=np.uint8)
+    prod = exp[log[a] + log[b]]
+    return np.where((a == 0) | (b == 0), np.uint8(0), prod)
+
+
+def inv(x, poly=IRREDUCIBLE_POLY):
+    """Inverse multiplikatif GF(2^8) vectorized (0 dipetakan ke 0)"""
+    return inverse_table(poly)[np.asarray(x, dtype=np.uint8)]
+
+
+def gf_inverse(x, poly=IRREDUCIBLE_POLY):
+    return int(inverse_table(poly)[x])
@@ -0,0 +1,179 @@
+# aljabar linear GF(2) untuk matriks affine 8x8
+#
+# Matriks disimpan sebagai 8 row ter-pack (uint8): bit j dari row i = M[i][j].
+# Dengan konvensi ini output bit i dari M x adalah parity(row_i & x), sama
+# seperti affine_transform_custom yang memakai bit i = (byte >> i) & 1.
+import numpy as np
+
+N_BITS = 8
+
+# Tabel parity 8-bit (dipakai untuk perkalian matriks-vektor)
+PARITY = np.array([bin(v).count('1') & 1 for v in range(256)], dtype=np.uint8)
+PARITY.setflags(write=False)
+
+_BIT_WEIGHTS = (1 << np.arange(N_BITS)).astype(np.uint8)
+
+
+def pack_matrix(matrix):
+    """Matriks 0/1 (8x8, atau batch (N,8,8)) -> row ter-pack uint8 (8,) / (N,8)"""
+    m = np.asarray(matrix)
+    if m.shape[-2:] != (N_BITS, N_BITS):
+        raise ValueError("Matrix harus 8x8")
+    if np.any((m != 0) & (m != 1)):
+        raise ValueError("Matrix hanya boleh berisi 0 atau 1")
+    return (m.astype(np.uint8) * _BIT_WEIGHTS).sum(axis=-1, dtype=np.uint8)
+
+
+def unpack_matrix(rows):
+    """Row ter-pack (8,) / (N,8) -> matriks 0/1 int (8,8) / (N,8,8)"""
+    rows = np.asarray(rows, dtype=np.uint8)
+    return ((rows[..., None] >> np.arange(N_BITS, dtype=np.uint8)) & 1).astype(int)
+
+
+def identity():
+    return _BIT_WEIGHTS.copy()
+
+
+# ---------------------------------------------------------------------------
+# Single matriks: operasi pada 8 int Python (paling cepat untuk satu kandidat)
+# ---------------------------------------------------------------------------
+
+def _eliminate(rows, track_inverse=False):
+    """Gauss-Jordan di GF(2); return (rank, inverse_rows atau None)"""
+    rows = [int(r) for r in rows]
+    aug = [1 << i for i in range(N_BITS)] if track_inverse else None
+    rank = 0
+    for col in range(N_BITS):
+        bit = 1 << col
+        pivot = next((r for r in range(rank, N_BITS) if rows[r] & bit), None)
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        if aug is not None:
+            aug[rank], aug[pivot] = aug[pivot], aug[rank]
+        for r in range(N_BITS):
+            if r != rank and rows[r] & bit:
+                rows[r] ^= rows[rank]
+                if aug is not None:
+                    aug[r] ^= aug[rank]
+        rank += 1
+    return rank, aug
+
+
+def rank(rows):
+    return _eliminate(rows)[0]
+
+
+def is_invertible(rows):
+    return rank(rows) == N_BITS
+
+
+def inverse(rows):
+    """Inverse matriks ter-pack; raise ValueError jika singular"""
+    r, aug = _eliminate(rows, track_inverse=True)
+    if r != N_BITS:
+        raise ValueError("Matrix tidak invertible di GF(2)")
+    return np.array(aug, dtype=np.uint8)
+
+
+def multiply(a, b):
+    """Perkalian A·B: row i = XOR dari row B[j] untuk setiap bit j di A[i]"""
+    out = []
+    for row in a:
+        acc = 0
+        row = int(row)
+        for j in range(N_BITS):
+            if row >> j & 1:
+                acc ^= int(b[j])
+        out.append(acc)
+    return np.array(out, dtype=np.uint8)
+
+
+def transpose(rows):
+    return pack_matrix(unpack_matrix(rows).T)
+
+
+def matvec(rows, x):
+    """M·x untuk byte (atau array byte) x, hasil dalam representasi byte"""
+    x = np.asarray(x, dtype=np.uint8)
+    rows = np.asarray(rows, dtype=np.uint8)
+    bits = PARITY[rows[:, None] & x.reshape(1, -1)]
+    return (bits * _BIT_WEIGHTS[:, None]).sum(axis=0, dtype=np.uint8).reshape(x.shape)
+
+
+# ---------------------------------------------------------------------------
+# Batch: array (N, 8) matriks ter-pack, eliminasi vectorized atas N
+# ---------------------------------------------------------------------------
+
+def _eliminate_batch(rows, track_inverse=False):
+    rows = np.array(rows, dtype=np.uint8, copy=True).reshape(-1, N_BITS)
+    n = rows.shape[0]
+    aug = np.tile(_BIT_WEIGHTS, (n, 1)) if track_inverse else None
+    ranks = np.zeros(n, dtype=np.int64)
+    row_idx = np.arange(N_BITS)
+
+    for col in range(N_BITS):
+        bit = np.uint8(1 << col)
+        candidate = ((rows & bit) != 0) & (row_idx[None, :] >= ranks[:, None])
+        found = np.flatnonzero(candidate.any(axis=1))
+        if found.size == 0:
+            continue
+        pivot = candidate[found].argmax(axis=1)
+        target = ranks[found]
+
+        # Swap row pivot ke posisi rank
+        for arr in (rows, aug) if aug is not None else (rows,):
+            tmp = arr[found, pivot].copy()
+            arr[found, pivot] = arr[found, target]
+            arr[found, target] = tmp
+
+        # Eliminasi kolom col di semua row lain
+        sub = rows[found]
+        hit = (sub & bit) != 0
+        hit[np.arange(found.size), target] = False
+        rows[found] = sub ^ np.where(hit, sub[np.arange(found.size), target][:, None], 0).astype(np.uint8)
+        if aug is not None:
+            sub_aug = aug[found]
+            aug[found] = sub_aug ^ np.where(hit, sub_aug[np.arange(found.size), target][:, None], 0).astype(np.uint8)
+
+        ranks[found] += 1
+    return ranks, aug
+
+
+def rank_batch(rows):
+    return _eliminate_batch(rows)[0]
+
+
+def is_invertible_batch(rows):
+    return rank_batch(rows) == N_BITS
+
+
+def inverse_batch(rows):
+    """Return (inverse (N,8), mask invertible (N,)); row singular berisi 0"""
+    ranks, aug = _eliminate_batch(rows, track_inverse=True)
+    ok = ranks == N_BITS
+    aug[~ok] = 0
+    return aug, ok
+
+
+def multiply_batch(a, b):
+    """Perkalian A·B untuk batch (N,8) x (N,8)"""
+    a = np.asarray(a, dtype=np.uint8).reshape(-1, N_BITS)
+    b = np.asarray(b, dtype=np.uint8).reshape(-1, N_BITS)
+    sel = ((a[:, :, None] >> np.arange(N_BITS, dtype=np.uint8)) & 1).astype(bool)  # (N,8,8)
+    return np.bitwise_xor.reduce(np.where(sel, b[:, None, :], 0).astype(np.uint8), axis=2)
+
+
+def transpose_batch(rows):
+    return pack_matrix(np.swapaxes(unpack_matrix(rows), -1, -2))
+
+
+def random_invertible_batch(n, rng=None):
+    """Generate n matriks invertible acak (N,8) dengan rejection sampling ter-vectorized"""
+    rng = rng if rng is not None else np.random.default_rng()
+    out = np.empty((0, N_BITS), dtype=np.uint8)
+    while out.shape[0] < n:
+        need = n - out.shape[0]
+        cand = rng.integers(0, 256, size=(max(4 * need, 16), N_BITS), dtype=np.uint8)
+        out = np.concatenate([out, cand[is_invertible_batch(cand)]])
+    return out[:n]
@@ -0,0 +1,201 @@
+# local search (hill climbing / simulated annealing) atas matriks affine
+#
+# State = 8 row ter-pack matriks A dari S(x) = A·inv(x) ^ c. Move: flip satu
+# bit di row r, atau row r ^= row k (selalu tetap invertible). Satu move hanya
+# mengubah coordinate function r, jadi tabel objective (kolom SAC r, 7
+# pasangan BIC yang memuat r, kontribusi r ke TO) di-update secara
+# incremental tanpa evaluasi ulang dari nol.
+import math
+import time
+
+import numpy as np
+
+from core import sbox_tables
+from core.field_gf256 import parse_poly
+from core.gf2_linalg import is_invertible, pack_matrix, random_invertible_batch, unpack_matrix
+from core.matrix_explorer import inverse_profile, rank_key, _candidate_records
+
+STRATEGIES = ('hill', 'anneal')
+OBJECTIVES = ('to', 'sac', 'bic_sac')  # semua diminimalkan
+
+# Index pasangan BIC (i < j) yang memuat row r, beserta partner-nya
+_PAIRS_OF = [np.array([p for p, (i, j) in enumerate(sbox_tables.BIT_PAIRS) if r in (i, j)]) for r in range(8)]
+_PARTNER = [np.array([j if i == r else i for i, j in sbox_tables.BIT_PAIRS if r in (i, j)]) for r in range(8)]
+_BETA = sbox_tables._BETA_SIGNS.astype(np.float64)       # (256 b, 8)
+_TO_NORM = sbox_tables.N * sbox_tables.N - sbox_tables.N
+
+
+class _Tracker:
+    """Tabel objective untuk satu state; propose() menghitung skor move tanpa mengubah state"""
+
+    def __init__(self, objective, profile, rows):
+        self.objective = objective
+        self.profile = profile
+        self.reset(rows)
+
+    def reset(self, rows):
+        self.rows = [int(r) for r in rows]
+        rows = np.array(self.rows, dtype=np.uint8)
+        mask_sac = self.profile['mask_sac']
+        if self.objective == 'sac':
+            self.table = np.abs(mask_sac[:, rows] - 0.5)                                # (8 in, 8 out)
+            self.score = float(self.table.mean())
+        elif self.objective == 'bic_sac':
+            pair_masks = rows[sbox_tables.PAIR_I] ^ rows[sbox_tables.PAIR_J]
+            self.table = np.abs(mask_sac[:, pair_masks] - 0.5)                          # (8 in, 28)
+            self.score = float(self.table.mean())
+        else:
+            self.table = _BETA @ self.profile['act'][rows].astype(np.float64)           # (256 b, 256 a)
+            self.score = self._to_score(self.table)
+
+    @staticmethod
+    def _to_score(mixed):
+        return float(sbox_tables.N_BITS - np.abs(mixed[:, 1:]).sum(axis=1).min() / _TO_NORM)
+
+    def propose(self, r, new_row):
+        """Return (skor baru, update) untuk row r -> new_row"""
+        mask_sac = self.profile['mask_sac']
+        if self.objective == 'sac':
+            col = np.abs(mask_sac[:, new_row] - 0.5)
+            score = self.score + float(col.sum() - self.table[:, r].sum()) / 64
+            return score, col
+        if self.objective == 'bic_sac':
+            partners = np.array(self.rows, dtype=np.uint8)[_PARTNER[r]]
+            cols = np.abs(mask_sac[:, partners ^ new_row] - 0.5)                        # (8, 7)
+            score = self.score + float(cols.sum() - self.table[:, _PAIRS_OF[r]].sum()) / self.table.size
+            return score, cols
+        act = self.profile['act']
+        diff = act[new_row].astype(np.float64) - act[self.rows[r]]
+        mixed = self.table + np.outer(_BETA[:, r], diff)                                 # rank-1 update
+        return self._to_score(mixed), mixed
+
+    def apply(self, r, new_row, score, update):
+        if self.objective == 'sac':
+            self.table[:, r] = update
+        elif self.objective == 'bic_sac':
+            self.table[:, _PAIRS_OF[r]] = update
+        else:
+            self.table = update
+        self.rows[r] = int(new_row)
+        self.score = score
+
+
+def _random_move(rows, rng):
+    """Pilih move acak; return (r, row baru) atau None jika flip membuat A singular"""
+    r = int(rng.integers(8))
+    if rng.random() < 0.5:
+        new_row = rows[r] ^ (1 << int(rng.integers(8)))
+        trial = list(rows)
+        trial[r] = new_row
+        if not is_invertible(trial):
+            return None
+        return r, new_row
+    k = int(rng.integers(7))
+    k += k >= r
+    return r, rows[r] ^ rows[k]
+
+
+def local_search(strategy='anneal', objective='to', iterations=5000, time_limit=None, seed=None,
+                 poly=None, start=None, top_k=10, patience=500, thresholds=None):
+    """
+    Cari matriks affine dengan objective terkecil lewat hill climbing / simulated annealing.
+
+    strategy: 'hill' (terima move yang tidak memperburuk, restart acak setelah
+    `patience` iterasi tanpa perbaikan) atau 'anneal' (terima move lebih buruk
+    dengan peluang exp(-delta / T), T turun geometrik sepanjang budget).
+    objective: 'to' (revised TO), 'sac' (rata-rata |SAC - 0.5|) atau 'bic_sac'
+    (rata-rata |BIC-SAC - 0.5|). Budget: `iterations` dan/atau `time_limit` detik.
+
+    Return dict {'results': top_k state terbaik yang dikunjungi (format
+    kandidat explorer + 'objective_score', disaring thresholds), 'iterations',
+    'accepted', 'restarts', 'elapsed', 'seed', 'start_score', 'best_score'}.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Strategy tidak dikenal: {strategy}")
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objective tidak dikenal: {objective}")
+    poly = parse_poly(poly)
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    rng = np.random.default_rng(seed)
+    iterations = max(int(iterations), 0)
+    top_k = max(int(top_k), 1)
+
+    if start is None:
+        rows = random_invertible_batch(1, rng)[0]
+    else:
+        rows = pack_matrix(start)
+        if not is_invertible(rows):
+            raise ValueError("Matrix awal tidak invertible di GF(2)")
+    tracker = _Tracker(objective, inverse_profile(poly), rows)
+    start_score = tracker.score
+    visited = {tuple(tracker.rows): tracker.score}
+
+    # Temperatur awal anneal: rata-rata |delta| beberapa move acak dari state awal
+    temperature = 0.0
+    if strategy == 'anneal':
+        deltas = []
+        for _ in range(64):
+            move = _random_move(tracker.rows, rng)
+            if move is not None:
+                deltas.append(abs(tracker.propose(*move)[0] - tracker.score))
+        temperature = float(np.mean(deltas)) if deltas else 0.0
+
+    began = time.perf_counter()
+    accepted = restarts = stale = done = 0
+    best_score = tracker.score
+    while done < iterations or (time_limit is not None and not iterations):
+        elapsed = time.perf_counter() - began
+        if time_limit is not None and elapsed >= time_limit:
+            break
+        done += 1
+        move = _random_move(tracker.rows, rng)
+        if move is None:
+            continue
+        score, update = tracker.propose(*move)
+        delta = score - tracker.score
+        if strategy == 'hill':
+            accept = delta <= 0
+        else:
+            progress = done / iterations if iterations else 0.0
+            if time_limit is not None:
+                progress = max(progress, elapsed / time_limit)
+            t = temperature * 1e-3 ** progress
+            accept = delta <= 0 or (t > 0 and rng.random() < math.exp(-delta / t))
+        if accept:
+            tracker.apply(*move, score, update)
+            accepted += 1
+            key = tuple(tracker.rows)
+            if key not in visited and (len(visited) < top_k or score < max(visited.values())):
+                visited[key] = score
+                if len(visited) > 4 * top_k:
+                    visited = dict(sorted(visited.items(), key=lambda kv: kv[1])[:top_k])
+        if tracker.score < best_score:
+            best_score, stale = tracker.score, 0
+        else:
+            stale += 1
+        if strategy == 'hill' and stale >= patience:
+            tracker.reset(random_invertible_batch(1, rng)[0])
+            visited.setdefault(tuple(tracker.rows), tracker.score)
+            restarts += 1
+            stale = 0
+
+    best = sorted(visited.items(), key=lambda kv: kv[1])[:top_k]
+    matrices = unpack_matrix(np.array([rows for rows, _ in best], dtype=np.uint8))
+    results, _, _ = _candidate_records(matrices, np.arange(len(best)), poly, thresholds)
+    for record in results:
+        record['objective_score'] = best[record['id']][1]
+    results.sort(key=lambda c: (c['objective_score'],) + rank_key(c))
+
+    return {
+        'results': results,
+        'strategy': strategy,
+        'objective': objective,
+        'iterations': done,
+        'accepted': accepted,
+        'restarts': restarts,
+        'elapsed': time.perf_counter() - began,
+        'seed': seed,
+        'start_score': start_score,
+        'best_score': best_score,
+    }
@@ -1,95 +1,566 @@
+# Explorer kandidat S(x) = A·inv(x) ^ c.
+#
+# Semua kandidat affine-equivalent dengan inverse GF(2^8): bijektif, balanced,
+# NL, LAP, DU dan BU sama untuk setiap A invertible, jadi cukup dihitung sekali
+# per polynomial. Coordinate j dari S adalah component (row_j(A))·inv ^ c_j,
+# sehingga SAC, BIC, derajat dan TO dibaca dari tabel per-mask milik inverse,
+# dan konstanta c hanya mempengaruhi fixed point.
+#
+# Dengan poly='all' ruang pencarian adalah pasangan (polynomial, A): setiap
+# kandidat mendapat polynomial acak dari registry, lalu satu chunk dievaluasi
+# per kelompok polynomial memakai profile inverse masing-masing.
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from functools import lru_cache
+from queue import Empty
+import heapq
+import multiprocessing
+
 import numpy as np
-from core.field_gf256 import gf_inverse
-from core.sbox_validator import is_bijective, is_balanced, check_sac, differential_uniformity, nonlinearity
+from core import sbox_tables
+from core.field_gf256 import format_poly, inverse_table, parse_poly, parse_polys
+from core.affine import affine_map, affine_map_batch, bits_to_byte
+from core.gf2_linalg import pack_matrix, unpack_matrix, is_invertible, random_invertible_batch
+from core.sbox import SBox
+from core.sbox_analysis import analyze_sbox
+from core.sbox_batch import THRESHOLDS, passes
+
+# Metric explorer (nama engine) untuk evaluasi satu S-box
+EXPLORER_METRICS = ['bijective', 'balanced', 'sac_pass', 'du', 'nl', 'alg_deg', 'to', 'bu']
+
+_TO_CHUNK = 256  # kandidat per perkalian TO, (chunk, 256, 256) float32
+FIRST_CHUNK = 64     # chunk pertama kecil supaya stream cepat mengirim hasil
+SHARD_CHUNK = 4096  # matriks maksimal per evaluasi batch di dalam satu shard
+
+# Worker process tidak di-fork langsung dari proses web (thread request Flask/
+# gunicorn + thread job queue): fork saat thread lain memegang lock (logging,
+# sqlite, BLAS) bisa membuat child deadlock.
+_MP_START = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
 
 
-def generate_random_invertible_matrix_8x8():
+def generate_random_invertible_matrix_8x8(rng=None):
     """Generate random 8x8 binary matrix yang invertible di GF(2)"""
-    max_attempts = 100
-    for _ in range(max_attempts):
-        M = np.random.randint(0, 2, size=(8, 8), dtype=int)
-        # Cek determinant mod 2 != 0 (invertible)
-        det = int(np.round(np.linalg.det(M))) % 2
-        if det == 1:
+    rng = rng if rng is not None else np.random.default_rng()
+    # Rejection sampling: ~29% matriks acak invertible, jadi loop cepat selesai
+    while True:
+        M = rng.integers(0, 2, size=(8, 8), dtype=int)
+        if is_invertible(pack_matrix(M)):
             return M
-    # Fallback: identity matrix jika gagal
-    return np.eye(8, dtype=int)
 
 
-def generate_random_vector_8():
+def generate_random_vector_8(rng=None):
     """Generate random 8-bit constant vector"""
-    return np.random.randint(0, 2, size=8, dtype=int)
+    rng = rng if rng is not None else np.random.default_rng()
+    return rng.integers(0, 2, size=8, dtype=int)
 
 
 def affine_transform_custom(byte, matrix, constant):
-    """Apply custom affine transform dengan matriks & konstanta tertentu"""
-    bits = np.array([(byte >> i) & 1 for i in range(8)], dtype=int)
-    mul = (matrix.dot(bits) % 2 + constant) % 2
-    out = 0
-    for i in range(8):
-        out |= (mul[i] << i)
-    return out
+    """Apply custom affine transform dengan matriks & konstanta (vector bit) tertentu"""
+    return int(affine_map([byte], matrix, bits_to_byte(constant))[0])
 
 
-def generate_sbox_from_affine(matrix, constant):
+def generate_sbox_from_affine(matrix, constant, poly=None):
     """Generate S-Box dari matriks affine + constant vector"""
-    sbox = []
-    for x in range(256):
-        inv = gf_inverse(x)
-        val = affine_transform_custom(inv, matrix, constant)
-        sbox.append(int(val))
-    return sbox
+    return affine_map(inverse_table(poly), matrix, bits_to_byte(constant)).tolist()
 
 
 def evaluate_sbox(sbox):
     """Evaluate properti S-Box, return dict score"""
+    m = analyze_sbox(sbox, EXPLORER_METRICS)
     return {
-        'bijective': is_bijective(sbox),
-        'balanced': is_balanced(sbox),
-        'sac': check_sac(sbox),
-        'differential_uniformity': differential_uniformity(sbox),
-        'nonlinearity': nonlinearity(sbox)
+        'bijective': m['bijective'],
+        'balanced': m['balanced'],
+        'sac': m['sac_pass'],
+        'differential_uniformity': m['du'],
+        'nonlinearity': m['nl'],
+        'alg_deg': m['alg_deg'],
+        'transparency_order': m['to'],
+        'boomerang_uniformity': m['bu']
     }
 
 
-def explore_affine_candidates(n_candidates=50, seed=None):
+def inverse_profile(poly=None):
     """
-    Generate n kandidat matriks affine, test semuanya, return ranked results.
-    
-    Returns:
-        List of dict: [{id, matrix, constant, sbox, metrics}, ...]
-        Sorted by nonlinearity (descending)
+    Tabel invariant + per-mask dari S-box inverse (sekali per polynomial):
+      invariants  : metric yang sama untuk semua kandidat (dict)
+      mask_sac    : (8 bit input, 256 mask) P(mask·(inv(x) ^ inv(x ^ e_i)) = 1)
+      mask_nl     : (256,) NL component mask·inv
+      mask_degree : (256,) derajat aljabar component mask·inv
+      act         : (256, 256) autocorrelation component mask·inv
     """
-    if seed is not None:
-        np.random.seed(seed)
-    
+    return _inverse_profile(parse_poly(poly))
+
+
+@lru_cache(maxsize=None)
+def _inverse_profile(poly):
+    base = SBox(inverse_table(poly))
+    diffs = sbox_tables.avalanche_diffs(base.array)                       # (8, 256)
+    parity = sbox_tables.popcount(sbox_tables._X[:, None, None] & diffs[None]) & 1
+    profile = {
+        'invariants': analyze_sbox(base, ['bijective', 'balanced', 'du', 'nl', 'lap', 'bu']),
+        'mask_sac': parity.mean(axis=2).T,
+        'mask_nl': sbox_tables.N // 2 - np.abs(base.walsh).max(axis=1) // 2,
+        'mask_degree': sbox_tables.algebraic_degrees(base.component_anf),
+        'act': base.act,
+    }
+    for value in profile.values():
+        if isinstance(value, np.ndarray):
+            value.setflags(write=False)
+    return profile
+
+
+def precompute_profiles(poly='all'):
+    """Bangun (dan cache) inverse_profile untuk satu polynomial atau 'all'"""
+    for p in parse_polys(poly):
+        inverse_profile(p)
+
+
+def _stage_degree(profile, rows, poly):
+    return {'alg_deg': profile['mask_degree'][rows].max(axis=1)}
+
+
+def _stage_sac(profile, rows, poly):
+    sac_table = profile['mask_sac'][:, rows].transpose(1, 0, 2)              # (N, 8 in, 8 out)
+    per_bit = sac_table.sum(axis=2)
+    return {
+        'sac': sac_table.reshape(rows.shape[0], -1).mean(axis=1),
+        'sac_pass': np.all((per_bit >= 3.0) & (per_bit <= 5.0), axis=1),
+        'sac_dist_max': np.abs(sac_table - 0.5).max(axis=(1, 2)),
+    }
+
+
+def _stage_bic(profile, rows, poly):
+    pair_masks = rows[:, sbox_tables.PAIR_I] ^ rows[:, sbox_tables.PAIR_J]   # (N, 28)
+    return {
+        'bic_nl': profile['mask_nl'][pair_masks].min(axis=1),
+        'bic_sac': profile['mask_sac'][:, pair_masks].mean(axis=(0, 2)),
+    }
+
+
+def _stage_fixed(profile, rows, poly):
+    # Fixed point S(x) = x  <=>  c = A·inv(x) ^ x: satu bincount untuk semua 256 konstanta
+    n = rows.shape[0]
+    linear = affine_map_batch(inverse_table(poly), unpack_matrix(rows), np.zeros(n))
+    offsets = np.arange(n, dtype=np.int64)[:, None] << 8
+    fixed_counts = np.bincount((offsets | (linear ^ sbox_tables._X)).ravel(),
+                               minlength=n * 256).reshape(n, 256)
+    constant, fixed, opposite, free = best_constants(fixed_counts)
+    return {'constant': constant, 'fixed_points': fixed + opposite, 'fixed': fixed,
+            'opposite_fixed': opposite, 'free_constants': free}
+
+
+def _stage_to(profile, rows, poly):
+    to = np.empty(rows.shape[0])
+    for start in range(0, rows.shape[0], _TO_CHUNK):
+        chunk = rows[start:start + _TO_CHUNK]
+        to[start:start + _TO_CHUNK] = sbox_tables.transparency_profile(profile['act'][chunk])[0]
+    return {'to': to}
+
+
+# Stage per matriks, urut dari yang paling murah (gather tabel -> bincount -> matmul TO)
+_AFFINE_STAGES = (_stage_degree, _stage_sac, _stage_bic, _stage_fixed, _stage_to)
+
+# Threshold explorer: semua threshold engine + jumlah fixed point (S(x) = x atau ~x)
+EXPLORER_THRESHOLDS = {**THRESHOLDS, 'max_fixed': ('fixed_points', 'max')}
+
+# Urutan metric saat threshold diterapkan: invariant dulu, lalu per stage
+_STAGE_METRICS = ('nl', 'du', 'lap', 'bu', 'alg_deg', 'sac', 'bic_nl', 'bic_sac', 'fixed_points', 'to')
+
+
+def evaluate_affine_batch(rows, poly=None, thresholds=None):
+    """
+    Metric yang bergantung pada matriks untuk batch matriks ter-pack (N, 8),
+    dievaluasi stage demi stage dengan early exit terhadap thresholds
+    ({parameter: batas}, lihat EXPLORER_THRESHOLDS).
+
+    Threshold metric invariant (NL, DU, LAP, BU) diputuskan sekali untuk
+    seluruh batch. Return (index lolos, dict array per metric untuk row
+    yang lolos, {parameter: jumlah kandidat dibuang}).
+    """
+    poly = parse_poly(poly)
+    profile = inverse_profile(poly)
+    rows = np.asarray(rows, dtype=np.uint8).reshape(-1, 8)
+    keep = np.arange(rows.shape[0])
+    checks = {EXPLORER_THRESHOLDS[k][0]: (k, v) for k, v in (thresholds or {}).items()}
+    pruned = {}
+
+    def apply(values):
+        nonlocal keep
+        for metric, (key, limit) in checks.items():
+            if metric not in values:
+                continue
+            ok = np.broadcast_to(passes(values[metric], EXPLORER_THRESHOLDS[key][1], limit), keep.shape)
+            pruned[key] = int((~ok).sum())
+            keep = keep[ok]
+            for name in metrics:
+                metrics[name] = metrics[name][ok]
+
+    metrics = {}
+    apply(profile['invariants'])
+    for stage in _AFFINE_STAGES:
+        if keep.size == 0:
+            break
+        values = stage(profile, rows[keep], poly)
+        metrics.update(values)
+        apply(values)
+    for key in checks.values():
+        pruned.setdefault(key[0], 0)
+    return keep, metrics, pruned
+
+
+def best_constants(fixed_counts):
+    """
+    Pilih konstanta per matriks dengan fixed point + opposite fixed point minimum.
+    S(x) = ~x  <=>  c ^ 0xFF = A·inv(x) ^ x, jadi opposite = fixed_counts[:, ::-1].
+    Return (constant, fixed_points, opposite_fixed_points, free_constants).
+    """
+    opposite = fixed_counts[:, ::-1]
+    total = fixed_counts + opposite
+    best = total.argmin(axis=1)
+    idx = np.arange(fixed_counts.shape[0])
+    return best, fixed_counts[idx, best], opposite[idx, best], (total == 0).sum(axis=1)
+
+
+def rank_key(candidate):
+    """
+    Key ranking kandidat. NL/DU/BU invariant di ruang ini, jadi urutan praktis
+    ditentukan oleh metric per matriks: SAC lolos, fixed point, transparency
+    order dan deviasi SAC (lebih kecil = lebih baik); id sebagai tiebreak
+    supaya merge top-k antar worker deterministik.
+    """
+    return (-candidate['nonlinearity'], candidate['diff_uniformity'], candidate['boomerang_uniformity'],
+            not candidate['sac'], candidate['fixed_points'] + candidate['opposite_fixed_points'],
+            candidate['transparency_order'], candidate['sac_dist_max'], candidate['id'])
+
+
+def merge_top(current, new, top_k=None):
+    """Gabungkan dua list kandidat, ambil top_k terbaik (None = semua)"""
+    merged = sorted(list(current) + list(new), key=rank_key)
+    return merged if top_k is None else merged[:top_k]
+
+
+def _heap_key(candidate):
+    # Kebalikan rank_key: root min-heap = kandidat terburuk yang masih disimpan
+    return tuple(-v for v in rank_key(candidate))
+
+
+def push_top(heap, candidate, top_k):
+    """
+    Masukkan kandidat ke min-heap top-k (ukuran tetap <= top_k).
+    Return True jika kandidat masuk ke top-k.
+    """
+    item = (_heap_key(candidate), candidate)
+    if len(heap) < top_k:
+        heapq.heappush(heap, item)
+        return True
+    if item[0] > heap[0][0]:
+        heapq.heapreplace(heap, item)
+        return True
+    return False
+
+
+def heap_sorted(heap):
+    """Isi heap top-k sebagai list kandidat ter-ranking"""
+    return [candidate for _, candidate in sorted(heap, reverse=True)]
+
+
+def top_rows(m, ids, top_k=None):
+    """
+    Posisi row m (hasil evaluate_affine_batch) terurut seperti rank_key, maksimal
+    top_k. NL/DU/BU invariant per polynomial, jadi cukup lexsort di array metric
+    sebelum dict kandidat dan S-box dibangun.
+    """
+    order = np.lexsort((ids, m['sac_dist_max'], m['to'], m['fixed_points'], ~m['sac_pass']))
+    return order if top_k is None else order[:top_k]
+
+
+def _candidate_records(matrices, ids, poly, thresholds, top_k=None):
+    """
+    Evaluasi batch matriks (N, 8, 8); return (top_k kandidat lolos terbaik
+    (None = semua, urutan input), pruned, jumlah lolos)
+    """
+    keep, m, pruned = evaluate_affine_batch(pack_matrix(matrices), poly, thresholds)
+    passed = int(keep.size)
+    if top_k is not None and passed > top_k:
+        best = top_rows(m, ids[keep], top_k)
+        keep, m = keep[best], {key: value[best] for key, value in m.items()}
+    return candidate_records(matrices, ids, keep, m, poly), pruned, passed
+
+
+def filter_metrics(m, poly, thresholds):
+    """
+    Terapkan thresholds ke hasil evaluate_affine_batch (tanpa threshold) dengan
+    urutan yang sama seperti stage explorer. Return (mask lolos, pruned).
+    """
+    invariants = inverse_profile(poly)['invariants']
+    ok = np.ones(len(m['to']), dtype=bool)
+    pruned = {}
+    for metric in _STAGE_METRICS:
+        for key, limit in (thresholds or {}).items():
+            if EXPLORER_THRESHOLDS[key][0] != metric:
+                continue
+            values = m[metric] if metric in m else invariants[metric]
+            passed = np.broadcast_to(passes(values, EXPLORER_THRESHOLDS[key][1], limit), ok.shape)
+            pruned[key] = int((ok & ~passed).sum())
+            ok &= passed
+    return ok, pruned
+
+
+def candidate_records(matrices, ids, keep, m, poly):
+    """Dict kandidat untuk matrices[keep]; m berisi metric row yang lolos (urutan keep)"""
+    poly = parse_poly(poly)
+    invariants = inverse_profile(poly)['invariants']
+    sboxes = affine_map_batch(inverse_table(poly), matrices[keep], m['constant']) if keep.size else []
+
     results = []
-    
-    for i in range(n_candidates):
-        M = generate_random_invertible_matrix_8x8()
-        C = generate_random_vector_8()
-        
-        sbox = generate_sbox_from_affine(M, C)
-        metrics = evaluate_sbox(sbox)
-        
+    for j, i in enumerate(keep):
         results.append({
-            'id': i,
-            'matrix': M.tolist(),  # convert to list for JSON serialization
-            'constant': C.tolist(),
-            'sbox': sbox,
-            'bijective': metrics['bijective'],
-            'balanced': metrics['balanced'],
-            'sac': metrics['sac'],
-            'diff_uniformity': metrics['differential_uniformity'],
-            'nonlinearity': metrics['nonlinearity']
+            'id': int(ids[i]),
+            'poly': format_poly(poly),
+            'matrix': matrices[i].tolist(),  # convert to list for JSON serialization
+            'constant': [int(m['constant'][j]) >> b & 1 for b in range(8)],
+            'sbox': sboxes[j].tolist(),
+            'bijective': invariants['bijective'],
+            'balanced': invariants['balanced'],
+            'sac': bool(m['sac_pass'][j]),
+            'sac_value': float(m['sac'][j]),
+            'sac_dist_max': float(m['sac_dist_max'][j]),
+            'diff_uniformity': invariants['du'],
+            'nonlinearity': invariants['nl'],
+            'lap': invariants['lap'],
+            'bic_nl': int(m['bic_nl'][j]),
+            'bic_sac': float(m['bic_sac'][j]),
+            'alg_deg': int(m['alg_deg'][j]),
+            'transparency_order': float(m['to'][j]),
+            'boomerang_uniformity': invariants['bu'],
+            'fixed_points': int(m['fixed'][j]),
+            'opposite_fixed_points': int(m['opposite_fixed'][j]),
+            'free_constants': int(m['free_constants'][j])
         })
-    
-    # Sort by nonlinearity (higher = better), then diff_uniformity (lower = better)
-    results.sort(key=lambda x: (-x['nonlinearity'], x['diff_uniformity']))
-    
     return results
 
 
+def _chunk_sizes():
+    """
+    Jadwal chunk tetap, tidak bergantung pada n: mulai kecil (hasil pertama
+    cepat) lalu berlipat dua sampai SHARD_CHUNK
+    """
+    start, chunk = 0, FIRST_CHUNK
+    while True:
+        yield start, chunk
+        start += chunk
+        chunk = min(chunk * 2, SHARD_CHUNK)
+
+
+def iter_shard(seed_seq, size, offset, polys, thresholds, top_k=None, skip=0):
+    """
+    Evaluasi satu shard per chunk; yield (jumlah dites, kandidat, pruned, jumlah lolos).
+    Dengan top_k hanya top_k terbaik per chunk (per polynomial) yang dijadikan
+    record; top-k gabungan tetap sama karena selalu subset dari top-k tiap chunk.
+
+    Matriks (dan polynomial, jika polys lebih dari satu) dibangkitkan dari
+    Generator milik shard per chunk penuh, jadi kandidat shard berukuran n
+    adalah prefix dari shard yang lebih besar dengan seed_seq yang sama.
+    skip kandidat pertama dibangkitkan tetapi tidak dievaluasi.
+    """
+    rng = np.random.default_rng(seed_seq)
+    for start, chunk in _chunk_sizes():
+        if start >= size:
+            break
+        rows = random_invertible_batch(chunk, rng)
+        choice = rng.integers(len(polys), size=chunk) if len(polys) > 1 else None
+        lo, hi = max(skip - start, 0), min(size - start, chunk)
+        if lo >= hi:
+            continue
+        matrices = unpack_matrix(rows[lo:hi])
+        ids = offset + start + np.arange(lo, hi)
+        count = hi - lo
+        if choice is None:
+            yield (count,) + _candidate_records(matrices, ids, polys[0], thresholds, top_k)
+            continue
+        choice = choice[lo:hi]
+        records, pruned, passed = [], {}, 0
+        for k in np.unique(choice):
+            sel = np.flatnonzero(choice == k)
+            part, part_pruned, part_passed = _candidate_records(matrices[sel], ids[sel], polys[k],
+                                                                thresholds, top_k)
+            records += part
+            passed += part_passed
+            for key, value in part_pruned.items():
+                pruned[key] = pruned.get(key, 0) + value
+        yield count, records, pruned, passed
+
+
+def _explore_shard(seed_seq, size, offset, polys, thresholds, top_k, progress=None, stop=None, skip=0):
+    """
+    Satu shard explorer (dipanggil in-process atau di worker process).
+    Hanya top_k terbaik yang disimpan, sehingga yang dikirim balik ke parent kecil.
+    progress(jumlah dites) dipanggil setelah tiap chunk; di worker process ini
+    Queue.put milik Manager. Shard berhenti lebih awal begitu stop (Event) di-set.
+    skip: lihat iter_shard.
+    """
+    best, pruned, passed = [], {}, 0
+    for count, records, chunk_pruned, chunk_passed in iter_shard(seed_seq, size, offset, polys,
+                                                                  thresholds, top_k, skip):
+        if stop is not None and stop.is_set():
+            break
+        if progress is not None:
+            progress(count)
+        passed += chunk_passed
+        for key, value in chunk_pruned.items():
+            pruned[key] = pruned.get(key, 0) + value
+        best = merge_top(best, records, top_k)
+    return best, pruned, passed
+
+
+def _poly_label(polys):
+    return 'all' if len(polys) > 1 else format_poly(polys[0])
+
+
+def explore_affine_stream(n_candidates=50, seed=None, poly=None, thresholds=None, top_k=10):
+    """
+    Versi streaming explore_affine (satu shard, hasil sama dengan workers=1).
+
+    Yield event dict: 'start', lalu 'progress' setelah tiap chunk (jumlah dites,
+    lolos, pruned; 'best' hanya jika top-k berubah), dan 'done' dengan top-k
+    akhir. Hanya min-heap top-k yang disimpan, jadi memori konstan untuk n
+    sebesar apa pun. poly: satu polynomial atau 'all'.
+    """
+    polys = parse_polys(poly)
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    n_candidates = max(int(n_candidates), 0)
+    top_k = max(int(top_k), 1)
+    yield {'event': 'start', 'n': n_candidates, 'seed': seed, 'top_k': top_k, 'poly': _poly_label(polys)}
+
+    heap, pruned, tested, passed = [], {}, 0, 0
+    shard = np.random.SeedSequence(seed).spawn(1)[0]
+    for count, records, chunk_pruned, chunk_passed in iter_shard(shard, n_candidates, 0, polys, thresholds, top_k):
+        tested += count
+        passed += chunk_passed
+        for key, value in chunk_pruned.items():
+            pruned[key] = pruned.get(key, 0) + value
+        changed = False
+        for candidate in records:
+            changed |= push_top(heap, candidate, top_k)
+        event = {'event': 'progress', 'tested': tested, 'passed': passed, 'pruned': dict(pruned)}
+        if changed:
+            event['best'] = heap_sorted(heap)
+        yield event
+
+    yield {'event': 'done', 'tested': tested, 'passed': passed, 'pruned': pruned,
+           'seed': seed, 'results': heap_sorted(heap)}
+
+
+def explore_affine(n_candidates=50, seed=None, poly=None, thresholds=None, workers=1, top_k=None, parallel=None,
+                   progress=None, max_procs=None, skip=0):
+    """
+    Generate n matriks affine acak, saring dengan thresholds, return ranked results.
+
+    Metric invariant diambil dari inverse_profile(); per matriks hanya metric
+    yang bergantung pada A yang dihitung. Konstanta tidak di-sample: dari 256
+    konstanta dipilih yang meminimalkan fixed point + opposite fixed point.
+
+    Kandidat dibagi ke `workers` shard, masing-masing dengan Generator dari
+    SeedSequence(seed).spawn(workers). Hasil hanya bergantung pada (seed,
+    workers), jadi run paralel (process pool) identik dengan run serial
+    (parallel=False). workers hanya jumlah partisi; ukuran pool process
+    dibatasi max_procs (mis. jumlah core) tanpa mengubah hasil.
+    Default parallel = min(workers, max_procs) > 1.
+
+    poly='all' mencari di ruang gabungan 30 polynomial x matriks; setiap
+    kandidat mencatat polynomial-nya di field 'poly'.
+
+    skip (hanya workers=1) melewati skip kandidat pertama: karena kandidat run
+    kecil adalah prefix run besar dengan seed sama, top-k run n bisa didapat dari
+    merge_top(top-k run skip tersimpan, hasil run ini).
+
+    progress(jumlah dites) opsional dipanggil setelah tiap chunk, juga pada run
+    paralel (worker melapor lewat Manager queue); exception dari callback
+    menghentikan run dan semua shard yang masih berjalan.
+
+    Return dict {'results': kandidat lolos (ranked, maksimal top_k), 'tested'
+    (tanpa skip), 'passed', 'pruned': {parameter: jumlah dibuang}, 'seed', 'workers', 'poly'}.
+    """
+    polys = parse_polys(poly)
+    precompute_profiles(poly)
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    n_candidates = max(int(n_candidates), 0)
+    workers = max(1, min(int(workers), n_candidates or 1))
+    skip = min(max(int(skip), 0), n_candidates)
+    if skip and workers > 1:
+        raise ValueError("skip hanya didukung untuk workers=1")
+    base, extra = divmod(n_candidates, workers)
+    sizes = [base + (i < extra) for i in range(workers)]
+    offsets = np.cumsum([0] + sizes[:-1]).tolist()
+    tasks = [(child, size, offset, polys, thresholds, top_k)
+             for child, size, offset in zip(np.random.SeedSequence(seed).spawn(workers), sizes, offsets)]
+
+    procs = workers if max_procs is None else max(1, min(workers, int(max_procs)))
+    outputs = [None] * workers
+    best = []
+    if parallel if parallel is not None else procs > 1:
+        context = multiprocessing.get_context(_MP_START)
+        with ExitStack() as stack:
+            updates = stop = None
+            if progress is not None:
+                # Worker melapor per chunk lewat queue; stop menghentikan shard saat callback raise (cancel)
+                manager = stack.enter_context(context.Manager())
+                updates, stop = manager.Queue(), manager.Event()
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=procs, mp_context=context))
+            futures = {pool.submit(_explore_shard, *task, updates.put if updates is not None else None, stop, skip): i
+                       for i, task in enumerate(tasks)}
+            pending = set(futures)
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    while updates is not None:
+                        try:
+                            progress(updates.get_nowait())
+                        except Empty:
+                            break
+                    for future in done:
+                        outputs[futures[future]] = future.result()
+                        best = merge_top(best, outputs[futures[future]][0], top_k)
+            except BaseException:
+                if stop is not None:
+                    stop.set()
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    else:
+        for i, task in enumerate(tasks):
+            outputs[i] = _explore_shard(*task, progress=progress, skip=skip)
+            best = merge_top(best, outputs[i][0], top_k)
+
+    pruned = {}
+    for _, shard_pruned, _ in outputs:
+        for key, value in shard_pruned.items():
+            pruned[key] = pruned.get(key, 0) + value
+    return {
+        'results': best,
+        'tested': n_candidates - skip,
+        'passed': sum(out[2] for out in outputs),
+        'pruned': pruned,
+        'seed': seed,
+        'workers': workers,
+        'poly': _poly_label(polys),
+    }
+
+
+def explore_affine_candidates(n_candidates=50, seed=None, poly=None, thresholds=None):
+    """
+    Generate n kandidat matriks affine, test semuanya, return ranked results.
+    
+    Returns:
+        List of dict datar per kandidat: id, poly, matrix, constant, sbox dan
+        metric (nonlinearity, diff_uniformity, sac, transparency_order, ...).
+        Urut menurut rank_key: NL/DU/BU invariant di ruang ini, jadi praktis
+        SAC lolos, fixed point, transparency order lalu deviasi SAC.
+    """
+    return explore_affine(n_candidates, seed, poly, thresholds)['results']
+
+
 def get_top_candidates(results, top_n=10):
     """Filter top N candidates dari hasil exploration"""
     return results[:top_n]
@@ -0,0 +1,125 @@
+# enumerasi lengkap family matriks affine terstruktur
+#
+# Family kecil (circulant, Toeplitz, companion, involutory) di-enumerasi penuh:
+# semua anggota dibangun sebagai row ter-pack, yang singular dibuang dengan
+# satu eliminasi batch, lalu sisanya dievaluasi lewat engine explorer
+# (metric invariant + per-mask, konstanta terbaik per matriks).
+import numpy as np
+
+from core.field_gf256 import parse_poly
+from core.gf2_linalg import identity, is_invertible_batch, multiply_batch, unpack_matrix
+from core.matrix_explorer import (SHARD_CHUNK, candidate_records, evaluate_affine_batch, filter_metrics,
+                                  inverse_profile, top_rows)
+
+FAMILIES = ('circulant', 'toeplitz', 'companion', 'involutory')
+
+_I = np.arange(8)
+
+
+def _rotl(values, shift):
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << shift) | (values >> (8 - shift))) & 0xFF
+
+
+def circulant_rows():
+    """255 matriks circulant: row i = rotl(row 0, i) (AES_MATRIX termasuk di sini)"""
+    first = np.arange(1, 256)
+    return np.stack([_rotl(first, i) for i in range(8)], axis=1).astype(np.uint8)
+
+
+def toeplitz_rows():
+    """2^15 matriks Toeplitz: M[i][j] = t_(j - i + 7), jadi row i = (t >> (7 - i)) & 0xFF"""
+    t = np.arange(1 << 15, dtype=np.int64)
+    return np.stack([(t >> (7 - i)) & 0xFF for i in range(8)], axis=1).astype(np.uint8)
+
+
+def companion_rows():
+    """256 companion matrix x^8 + c_7 x^7 + ... + c_0: sub-diagonal 1, kolom terakhir = c"""
+    c = np.arange(256, dtype=np.int64)
+    shift = np.where(_I >= 1, 1 << (_I - 1), 0)
+    return (shift[None, :] | (((c[:, None] >> _I) & 1) << 7)).astype(np.uint8)
+
+
+def involutory_rows():
+    """
+    Matriks Toeplitz involutory (A·A = I). Seluruh involution di GL(8, 2)
+    terlalu banyak untuk di-enumerasi, jadi family ini dibatasi ke Toeplitz.
+    """
+    rows = toeplitz_rows()
+    return rows[np.all(multiply_batch(rows, rows) == identity(), axis=1)]
+
+
+_BUILDERS = {
+    'circulant': circulant_rows,
+    'toeplitz': toeplitz_rows,
+    'companion': companion_rows,
+    'involutory': involutory_rows,
+}
+
+
+def family_rows(family):
+    """Semua anggota family (termasuk yang singular) sebagai row ter-pack (N, 8)"""
+    try:
+        return _BUILDERS[family]()
+    except KeyError:
+        raise ValueError(f"Family matriks tidak dikenal: {family}")
+
+
+def _summary(values):
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return None
+    return {'min': float(values.min()), 'max': float(values.max()), 'mean': float(values.mean())}
+
+
+def _histogram(values):
+    counts = np.bincount(np.asarray(values, dtype=np.int64))
+    return {int(v): int(c) for v, c in enumerate(counts) if c}
+
+
+def explore_family(family, poly=None, thresholds=None, top_k=None):
+    """
+    Evaluasi seluruh anggota invertible satu family.
+
+    Return dict {'family', 'results': kandidat lolos thresholds (ranked,
+    maksimal top_k), 'stats': statistik family atas semua anggota invertible,
+    'pruned': {parameter: jumlah dibuang}}.
+    """
+    poly = parse_poly(poly)
+    members = family_rows(family)
+    invertible = np.flatnonzero(is_invertible_batch(members))
+    rows = members[invertible]
+
+    parts = [evaluate_affine_batch(rows[start:start + SHARD_CHUNK], poly)[1]
+             for start in range(0, rows.shape[0], SHARD_CHUNK)]
+    m = {key: np.concatenate([p[key] for p in parts]) for key in parts[0]} if parts else {}
+
+    stats = {
+        'members': int(members.shape[0]),
+        'invertible': int(invertible.size),
+        'pairs': int(invertible.size) * 256,
+        'invariants': inverse_profile(poly)['invariants'],
+    }
+    if not m:
+        return {'family': family, 'results': [], 'stats': stats, 'pruned': {}}
+
+    stats.update({
+        'fixed_point_free_pairs': int(m['free_constants'].sum()),
+        'fixed_point_free_matrices': int((m['fixed_points'] == 0).sum()),
+        'sac_pass': int(m['sac_pass'].sum()),
+        'sac_value': _summary(m['sac']),
+        'bic_sac': _summary(m['bic_sac']),
+        'transparency_order': _summary(m['to']),
+        'bic_nl': _histogram(m['bic_nl']),
+        'alg_deg': _histogram(m['alg_deg']),
+    })
+
+    ok, pruned = filter_metrics(m, poly, thresholds)
+    stats['passed'] = int(ok.sum())
+
+    # Ranking rank_key dihitung di array (top_rows) supaya dict kandidat hanya dibangun untuk top_k
+    order = top_rows(m, invertible)
+    keep = order[ok[order]][:top_k]
+    kept = {key: value[keep] for key, value in m.items()}
+    results = candidate_records(unpack_matrix(rows), invertible, keep, kept, poly)
+    return {'family': family, 'results': results, 'stats': stats, 'pruned': pruned}
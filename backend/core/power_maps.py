@@ -0,0 +1,82 @@
+# S-box power mapping x^d di GF(2^8)
+#
+# x^d bijektif tepat saat gcd(d, 255) = 1 (128 exponent, termasuk inverse
+# d = 254). Dengan tabel log/antilog x^d = exp[(d * log x) mod 255], jadi
+# seluruh family dibangun dengan satu lookup (N, 255). Exponent satu kelas
+# cyclotomic {d, 2d, 4d, ...} mod 255 berbeda hanya oleh Frobenius (x -> x^2,
+# linear), sehingga S-box-nya affine-equivalent, juga setelah stage affine
+# A·x^d ^ c: metric invariant cukup dihitung sekali per kelas.
+from math import gcd
+
+import numpy as np
+
+from core.affine import affine_map
+from core.field_gf256 import field_tables
+from core.sbox_batch import batch_records, evaluate_batch
+
+POWER_EXPONENTS = tuple(d for d in range(1, 255) if gcd(d, 255) == 1)
+
+# Metric default sweep
+SWEEP_METRICS = ['nl', 'du', 'alg_deg', 'lap', 'bu', 'sac', 'sac_pass', 'bic_nl', 'bic_sac', 'to']
+
+# Metric yang sama untuk S-box affine-equivalent: dihitung di wakil kelas saja
+_CLASS_INVARIANT = {'bijective', 'du', 'dap', 'diff_spectrum', 'nl', 'lap', 'max_bias',
+                    'linear_spectrum', 'alg_deg', 'bu'}
+
+
+def cyclotomic_leader(d):
+    """Wakil (exponent terkecil) kelas cyclotomic {d * 2^k mod 255}"""
+    return min((d << k) % 255 for k in range(8))
+
+
+def _exponents(exponents):
+    d = np.asarray(POWER_EXPONENTS if exponents is None else exponents, dtype=np.int64).reshape(-1)
+    bad = [int(v) for v in d if not 1 <= v <= 254 or gcd(int(v), 255) != 1]
+    if bad:
+        raise ValueError(f"Exponent harus 1..254 dan coprime dengan 255 (x^d bijektif): {bad}")
+    return d
+
+
+def power_sboxes(exponents=None, poly=None, matrix=None, constant=0):
+    """
+    Tumpukan S-box x^d (N, 256) uint8 untuk exponent (default semua
+    POWER_EXPONENTS); jika matrix diberikan, hasilnya A·x^d ^ constant.
+    """
+    d = _exponents(exponents)
+    exp, log, _ = field_tables(poly)
+    out = np.zeros((d.size, 256), dtype=np.uint8)
+    out[:, 1:] = exp[(d[:, None] * log[None, 1:]) % 255]
+    if matrix is not None:
+        out = affine_map(out, matrix, constant)
+    return out
+
+
+def sweep_power_maps(poly=None, matrix=None, constant=0, metrics=None):
+    """
+    Analisis seluruh family power mapping (128 exponent) lewat engine batch.
+
+    Metric invariant (NL, DU, LAP, BU, derajat) dihitung hanya untuk 16 wakil
+    kelas cyclotomic lalu disebar ke anggotanya; sisanya per exponent.
+    Return list dict {'d', 'cyclotomic_class', 'sbox', metric...} ranked
+    berdasarkan NL (tinggi), DU (rendah), derajat (tinggi), lalu d.
+    """
+    names = list(dict.fromkeys(['nl', 'du', 'alg_deg'] + list(SWEEP_METRICS if metrics is None else metrics)))
+    d = np.array(POWER_EXPONENTS, dtype=np.int64)
+    sboxes = power_sboxes(d, poly, matrix, constant)
+
+    leaders = np.array([cyclotomic_leader(int(v)) for v in d])
+    classes, member_class = np.unique(leaders, return_inverse=True)
+    rep = np.searchsorted(d, classes)
+
+    invariant = [n for n in names if n in _CLASS_INVARIANT]
+    per_row = [n for n in names if n not in _CLASS_INVARIANT]
+    values = {}
+    for name, column in evaluate_batch(sboxes[rep], invariant).items():
+        values[name] = (column[member_class] if isinstance(column, np.ndarray)
+                        else [column[i] for i in member_class])
+    values.update(evaluate_batch(sboxes, per_row))
+
+    records = batch_records({name: values[name] for name in names})
+    order = np.lexsort((d, -values['alg_deg'], values['du'], -values['nl']))
+    return [{'d': int(d[i]), 'cyclotomic_class': int(leaders[i]), 'sbox': sboxes[i].tolist(), **records[i]}
+            for i in order]
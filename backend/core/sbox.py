@@ -0,0 +1,150 @@
+# representasi S-box immutable dengan tabel turunan yang di-cache
+import numpy as np
+
+from core import sbox_tables
+
+
+class SBox:
+    """
+    S-box 8-bit immutable, disimpan sebagai buffer bytes 256 entry.
+
+    Hash/eq berdasarkan isi, sehingga bisa dipakai sebagai key dict/cache.
+    Tabel turunan (inverse, DDT, LAT, ANF, bit-plane) dihitung saat pertama
+    kali diakses lalu disimpan; array yang dikembalikan read-only.
+    """
+
+    __slots__ = ('_data', '_cache')
+
+    def __init__(self, values):
+        if isinstance(values, SBox):
+            data = values._data
+        elif isinstance(values, (bytes, bytearray, memoryview)):
+            data = bytes(values)
+        else:
+            arr = np.asarray(values)
+            if arr.size != 256:
+                raise ValueError(f"S-box harus 256 nilai, diterima {arr.size}")
+            arr = arr.reshape(256).astype(np.int64)
+            if arr.min() < 0 or arr.max() > 255:
+                raise ValueError("Nilai S-box harus di rentang 0..255")
+            data = arr.astype(np.uint8).tobytes()
+        if len(data) != 256:
+            raise ValueError(f"S-box harus 256 nilai, diterima {len(data)}")
+        self._data = data
+        self._cache = {}
+
+    # --- konversi -----------------------------------------------------------
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def array(self):
+        """View uint8 read-only (zero-copy) atas buffer"""
+        return np.frombuffer(self._data, dtype=np.uint8)
+
+    @property
+    def grid(self):
+        """View 16x16 read-only (zero-copy)"""
+        return self.array.reshape(16, 16)
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.array
+        return arr if dtype is None else arr.astype(dtype)
+
+    def tolist(self):
+        """List 256 int Python (siap untuk jsonify)"""
+        return list(self._data)
+
+    def to_matrix(self):
+        """List 16x16 int Python, format yang dikembalikan handler Flask"""
+        data = self._data
+        return [list(data[i:i + 16]) for i in range(0, 256, 16)]
+
+    # --- protokol sequence --------------------------------------------------
+
+    def __len__(self):
+        return 256
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(self._data[idx])
+        return self._data[idx]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, SBox):
+            return self._data == other._data
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __repr__(self):
+        return f"SBox({self._data[:4].hex()}...{self._data[-2:].hex()})"
+
+    def __reduce__(self):
+        return (SBox, (self._data,))
+
+    # --- tabel turunan (lazy + cached) --------------------------------------
+
+    def cached(self, key, compute):
+        """Ambil intermediate dari cache, hitung sekali jika belum ada"""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+            self._cache[key] = value
+            return value
+
+    @property
+    def is_bijective(self):
+        return self.cached('bijective', lambda: len(set(self._data)) == 256)
+
+    @property
+    def inverse(self):
+        """Inverse S-box (SBox); raise ValueError jika tidak bijektif"""
+        return self.cached('inverse', lambda: SBox(sbox_tables.inverse_sbox(self.array)))
+
+    @property
+    def bit_matrix(self):
+        """Matriks komponen bit (8, 256): row i = bit output ke-i"""
+        return self.cached('bit_matrix', lambda: sbox_tables.bit_planes(self.array))
+
+    @property
+    def ddt(self):
+        return self.cached('ddt', lambda: sbox_tables.ddt(self.array))
+
+    @property
+    def walsh(self):
+        """Walsh spectrum (256 component b, 256 mask a) via FWHT"""
+        return self.cached('walsh', lambda: sbox_tables.walsh_spectrum(self.array))
+
+    @property
+    def act(self):
+        """Autocorrelation table ACT[b, a] semua component, dari Walsh spectrum"""
+        return self.cached('act', lambda: sbox_tables.autocorrelation(self.walsh))
+
+    @property
+    def lat(self):
+        return self.cached('lat', lambda: sbox_tables.lat(self.array, self.walsh))
+
+    @property
+    def anf(self):
+        """ANF 8 coordinate function (8, 256)"""
+        return self.cached('anf', lambda: sbox_tables.moebius(self.bit_matrix))
+
+    @property
+    def component_anf(self):
+        """ANF semua 256 component function (256, 256); dihitung hanya jika diminta"""
+        return self.cached('component_anf', lambda: sbox_tables.component_anf(self.array))
+
+    @property
+    def bct(self):
+        """Boomerang connectivity table; raise ValueError jika tidak bijektif"""
+        return self.cached('bct', lambda: sbox_tables.bct(self.array))
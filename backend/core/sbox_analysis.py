@@ -0,0 +1,312 @@
+# engine analisis S-box: metric dihitung lewat dependency graph
+#
+# Setiap intermediate (DDT, LAT, avalanche, ...) dan metric didaftarkan
+# bersama dependensinya. analyze_sbox() me-resolve graph untuk metric yang
+# diminta dan menyimpan hasil di cache SBox, sehingga tiap intermediate
+# dihitung tepat sekali per S-box walaupun dipakai banyak metric/endpoint.
+import numpy as np
+
+from core import sbox_tables
+from core.sbox import SBox
+
+_NODES = {}  # name -> (deps, fn)
+METRICS = []  # urutan default metric publik
+
+
+def _node(name, *deps, public=False):
+    def register(fn):
+        _NODES[name] = (deps, fn)
+        if public:
+            METRICS.append(name)
+        return fn
+    return register
+
+
+def _metric(name, *deps):
+    return _node(name, *deps, public=True)
+
+
+def resolve(sbox, name):
+    """Hitung node `name` (beserta dependensinya) satu kali per S-box"""
+    try:
+        deps, fn = _NODES[name]
+    except KeyError:
+        raise ValueError(f"Metric tidak dikenal: {name}")
+    return sbox.cached(name, lambda: fn(sbox, *(resolve(sbox, d) for d in deps)))
+
+
+def analyze_sbox(sbox, metrics=None):
+    """
+    Analisis S-box dalam satu panggilan.
+
+    sbox: SBox atau sequence 256 int. metrics: iterable nama metric
+    (default semua metric di METRICS). Return dict nilai JSON-safe.
+    """
+    if not isinstance(sbox, SBox):
+        sbox = SBox(sbox)
+    names = METRICS if metrics is None else list(metrics)
+    return {name: resolve(sbox, name) for name in names}
+
+
+# ---------------------------------------------------------------------------
+# Intermediates
+# ---------------------------------------------------------------------------
+
+@_node('bit_matrix')
+def _bit_matrix(sb):
+    return sb.bit_matrix
+
+
+@_node('ddt')
+def _ddt(sb):
+    return sb.ddt
+
+
+@_node('walsh')
+def _walsh(sb):
+    return sb.walsh
+
+
+@_node('lat', 'walsh')
+def _lat(sb, walsh):
+    return sb.lat
+
+
+@_node('anf')
+def _anf(sb):
+    return sb.anf
+
+
+@_node('coord_degrees', 'anf')
+def _coord_degrees(sb, table):
+    return sbox_tables.algebraic_degrees(table)
+
+
+@_node('component_degrees')
+def _component_degrees(sb):
+    return sbox_tables.algebraic_degrees(sb.component_anf[1:])
+
+
+@_node('act', 'walsh')
+def _act(sb, walsh):
+    return sb.act
+
+
+@_node('coord_autocorr', 'walsh')
+def _coord_autocorr(sb, walsh):
+    """Autocorrelation 8 coordinate function (component mask 1 << i)"""
+    return sbox_tables.autocorrelation(walsh[1 << np.arange(8)])
+
+
+@_node('transparency', 'coord_autocorr')
+def _transparency(sb, autocorr):
+    return sbox_tables.transparency_order(autocorr)
+
+
+@_node('avalanche_diffs')
+def _avalanche_diffs(sb):
+    return sbox_tables.avalanche_diffs(sb.array)
+
+
+@_node('avalanche_planes', 'avalanche_diffs')
+def _avalanche_planes(sb, diffs):
+    return sbox_tables.avalanche_planes(diffs)
+
+
+@_node('sac_table', 'avalanche_planes')
+def _sac_table(sb, planes):
+    return sbox_tables.sac_matrix(planes)
+
+
+@_node('bic_tables', 'avalanche_planes')
+def _bic_tables(sb, planes):
+    return sbox_tables.bic_sac_tables(planes)
+
+
+@_node('avalanche_per_bit', 'sac_table')
+def _avalanche_per_bit(sb, table):
+    return table.sum(axis=1)  # rata-rata bit output berubah per bit input
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+@_metric('bijective')
+def _bijective(sb):
+    return bool(sb.is_bijective)
+
+
+@_metric('bit_balance', 'bit_matrix')
+def _bit_balance(sb, bits):
+    return [int(v) for v in bits.sum(axis=1)]
+
+
+@_metric('balanced', 'bit_balance')
+def _balanced(sb, counts):
+    return all(120 <= c <= 136 for c in counts)  # ±8 tolerance
+
+
+@_metric('avalanche', 'avalanche_per_bit')
+def _avalanche(sb, per_bit):
+    return {f'bit_{b}': round(float(v), 4) for b, v in enumerate(per_bit)}
+
+
+@_metric('sac', 'sac_table')
+def _sac(sb, table):
+    return float(table.mean())  # proporsi bit output yang berubah
+
+
+@_metric('sac_pass', 'avalanche_per_bit')
+def _sac_pass(sb, per_bit):
+    return bool(np.all((per_bit >= 3.0) & (per_bit <= 5.0)))
+
+
+@_metric('sac_matrix', 'sac_table')
+def _sac_matrix(sb, table):
+    """Matriks probabilitas SAC 8x8 (row = bit input, kolom = bit output)"""
+    return np.round(table, 6).tolist()
+
+
+@_metric('sac_dist_max', 'sac_table')
+def _sac_dist_max(sb, table):
+    """Deviasi terbesar entry SAC dari 0.5"""
+    return float(np.abs(table - 0.5).max())
+
+
+@_metric('sac_dist_mean', 'sac_table')
+def _sac_dist_mean(sb, table):
+    return float(np.abs(table - 0.5).mean())
+
+
+@_metric('du', 'ddt')
+def _du(sb, table):
+    return int(table[1:].max())
+
+
+@_metric('dap', 'ddt')
+def _dap(sb, table):
+    """Differential approximation probability: max_{dx!=0, dy} DDT[dx, dy] / 256"""
+    return float(table[1:].max() / 256)
+
+
+@_metric('diff_spectrum', 'ddt')
+def _diff_spectrum(sb, table):
+    return sbox_tables.differential_spectrum(table)
+
+
+@_metric('nl', 'walsh')
+def _nl(sb, walsh):
+    return sbox_tables.nonlinearity(walsh)
+
+
+@_metric('lap', 'lat')
+def _lap(sb, table):
+    """max |LAT[a, b]| untuk a, b != 0 (16 untuk S-box AES)"""
+    return int(np.abs(table[1:, 1:]).max())
+
+
+@_metric('max_bias', 'lap')
+def _max_bias(sb, lap):
+    """Bias maksimum linear approximation: max |P(a·x = b·S(x)) - 1/2|"""
+    return lap / 256
+
+
+@_metric('linear_spectrum', 'lat')
+def _linear_spectrum(sb, table):
+    return sbox_tables.linear_spectrum(table)
+
+
+@_metric('bic_nl', 'walsh')
+def _bic_nl(sb, walsh):
+    """min NL(S_i XOR S_j) atas 28 pasangan bit output"""
+    return int(sbox_tables.bic_nonlinearity(walsh).min())
+
+
+@_metric('bic_sac', 'bic_tables')
+def _bic_sac(sb, tables):
+    """Rata-rata P(S_i XOR S_j berubah) atas semua bit input dan 28 pasangan"""
+    return float(tables[0].mean())
+
+
+@_metric('bic_sac_matrix', 'bic_tables')
+def _bic_sac_matrix(sb, tables):
+    """Matriks 8x8 (pasangan bit output) BIC-SAC rata-rata atas bit input; diagonal 0"""
+    out = np.zeros((8, 8))
+    out[sbox_tables.PAIR_I, sbox_tables.PAIR_J] = tables[0].mean(axis=0)
+    out += out.T
+    return np.round(out, 6).tolist()
+
+
+@_metric('bic_corr_max', 'bic_tables')
+def _bic_corr_max(sb, tables):
+    """Korelasi absolut terbesar antar variabel avalanche dua bit output (ideal 0)"""
+    return float(np.abs(tables[1]).max())
+
+
+@_metric('alg_deg', 'coord_degrees')
+def _alg_deg(sb, degrees):
+    """Derajat aljabar S-box = max derajat coordinate function"""
+    return int(degrees.max())
+
+
+@_metric('alg_deg_min', 'coord_degrees')
+def _alg_deg_min(sb, degrees):
+    return int(degrees.min())
+
+
+@_metric('coordinate_degrees', 'coord_degrees')
+def _coordinate_degrees(sb, degrees):
+    return [int(d) for d in degrees]
+
+
+@_metric('anf_terms', 'anf')
+def _anf_terms(sb, table):
+    """Jumlah monomial ANF per coordinate function"""
+    return [int(c) for c in table.sum(axis=1)]
+
+
+@_metric('component_deg_range', 'component_degrees')
+def _component_deg_range(sb, degrees):
+    """(min, max) derajat atas semua 255 component function b·S"""
+    return [int(degrees.min()), int(degrees.max())]
+
+
+@_metric('to', 'transparency')
+def _to(sb, transparency):
+    """Revised transparency order (Chakraborty et al.); lebih kecil lebih tahan DPA"""
+    return transparency[0]
+
+
+@_metric('to_original', 'transparency')
+def _to_original(sb, transparency):
+    """Transparency order versi awal (Prouff 2005)"""
+    return transparency[1]
+
+
+@_metric('bu', 'bijective')
+def _bu(sb, bijective):
+    """Boomerang uniformity: max BCT[a, b] untuk a, b != 0 (None jika tidak bijektif)"""
+    return int(sb.bct[1:, 1:].max()) if bijective else None
+
+
+@_metric('bct_spectrum', 'bijective')
+def _bct_spectrum(sb, bijective):
+    return sbox_tables.boomerang_spectrum(sb.bct) if bijective else None
+
+
+@_metric('absolute_indicator', 'act')
+def _absolute_indicator(sb, act):
+    """max |ACT[b, a]| untuk b, a != 0 (GAC; 32 untuk S-box AES)"""
+    return int(np.abs(act[1:, 1:]).max())
+
+
+@_metric('sum_of_squares', 'act')
+def _sum_of_squares(sb, act):
+    """Sum-of-squares indicator terbesar atas component: max_b sum_a ACT[b, a]^2"""
+    return int((act[1:].astype(np.int64) ** 2).sum(axis=1).max())
+
+
+@_metric('act_spectrum', 'act')
+def _act_spectrum(sb, act):
+    return sbox_tables.autocorrelation_spectrum(act)
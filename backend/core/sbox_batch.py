@@ -0,0 +1,263 @@
+# evaluasi metric untuk tumpukan S-box (N, 256) sekaligus
+#
+# Sama seperti core.sbox_analysis, metric didaftarkan sebagai node dengan
+# dependensi, tetapi setiap node bekerja pada satu chunk (M, 256) dan
+# mengembalikan nilai per row. Chunking membatasi memori: tensor terbesar
+# (Walsh/DDT/BCT) berukuran M x 256 x 256.
+import numpy as np
+
+from core import sbox_tables
+
+DEFAULT_CHUNK = 64
+
+_BATCH_NODES = {}  # name -> (deps, fn)
+BATCH_METRICS = []
+
+
+def _node(name, *deps, public=False):
+    def register(fn):
+        _BATCH_NODES[name] = (deps, fn)
+        if public:
+            BATCH_METRICS.append(name)
+        return fn
+    return register
+
+
+def _metric(name, *deps):
+    return _node(name, *deps, public=True)
+
+
+def _resolve(cache, sboxes, name):
+    if name not in cache:
+        try:
+            deps, fn = _BATCH_NODES[name]
+        except KeyError:
+            raise ValueError(f"Metric batch tidak dikenal: {name}")
+        cache[name] = fn(sboxes, *(_resolve(cache, sboxes, d) for d in deps))
+    return cache[name]
+
+
+def evaluate_batch(sboxes, metrics=None, chunk_size=DEFAULT_CHUNK):
+    """
+    Hitung metric untuk N S-box sekaligus.
+
+    sboxes: array-like (N, 256) nilai 0..255. metrics: iterable nama metric
+    (default semua metric di BATCH_METRICS). Return dict name -> array (N,)
+    untuk metric skalar, atau list N item untuk spectrum.
+    """
+    arr = np.asarray(sboxes)
+    if arr.ndim != 2 or arr.shape[1] != sbox_tables.N:
+        raise ValueError("Batch S-box harus berbentuk (N, 256)")
+    if arr.size and (arr.min() < 0 or arr.max() > 255):
+        raise ValueError("Nilai S-box harus di rentang 0..255")
+    arr = arr.astype(np.uint8)
+    names = BATCH_METRICS if metrics is None else list(metrics)
+    for name in names:
+        if name not in _BATCH_NODES:
+            raise ValueError(f"Metric batch tidak dikenal: {name}")
+
+    parts = {name: [] for name in names}
+    for start in range(0, arr.shape[0], max(int(chunk_size), 1)):
+        chunk = arr[start:start + chunk_size]
+        cache = {}
+        for name in names:
+            value = _resolve(cache, chunk, name)
+            if isinstance(value, np.ndarray):
+                parts[name].append(value)
+            else:
+                parts[name].extend(value)
+    return {name: (np.concatenate(vals) if vals and isinstance(vals[0], np.ndarray) else vals)
+            for name, vals in parts.items()}
+
+
+def batch_records(results):
+    """Ubah hasil evaluate_batch menjadi list dict JSON-safe (format analyze_sbox)"""
+    names = list(results)
+    n = len(results[names[0]]) if names else 0
+    columns = {name: (results[name].tolist() if isinstance(results[name], np.ndarray) else results[name])
+               for name in names}
+    if 'bu' in columns:  # -1 menandai S-box tidak bijektif
+        columns['bu'] = [None if v < 0 else v for v in columns['bu']]
+    return [{name: columns[name][i] for name in names} for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Intermediates (per chunk)
+# ---------------------------------------------------------------------------
+
+@_node('bit_planes')
+def _bit_planes(sb):
+    return sbox_tables.bit_planes(sb)
+
+
+@_node('ddt')
+def _ddt(sb):
+    return sbox_tables.ddt(sb)
+
+
+@_node('walsh')
+def _walsh(sb):
+    return sbox_tables.walsh_spectrum(sb)
+
+
+@_node('avalanche_planes')
+def _avalanche_planes(sb):
+    return sbox_tables.avalanche_planes(sbox_tables.avalanche_diffs(sb))
+
+
+@_node('sac_table', 'avalanche_planes')
+def _sac_table(sb, planes):
+    return sbox_tables.sac_matrix(planes)
+
+
+@_node('bic_tables', 'avalanche_planes')
+def _bic_tables(sb, planes):
+    return sbox_tables.bic_sac_tables(planes)
+
+
+@_node('coord_degrees', 'bit_planes')
+def _coord_degrees(sb, planes):
+    return sbox_tables.algebraic_degrees(sbox_tables.moebius(planes))
+
+
+@_node('transparency', 'walsh')
+def _transparency(sb, walsh):
+    return sbox_tables.transparency_profile(sbox_tables.autocorrelation(walsh[:, 1 << np.arange(8)]))
+
+
+# ---------------------------------------------------------------------------
+# Metrics: nilai identik dengan metric bernama sama di sbox_analysis
+# ---------------------------------------------------------------------------
+
+@_metric('bijective')
+def _bijective(sb):
+    return sbox_tables.is_permutation(sb)
+
+
+@_metric('balanced', 'bit_planes')
+def _balanced(sb, planes):
+    counts = planes.sum(axis=-1, dtype=np.int64)
+    return np.all((counts >= 120) & (counts <= 136), axis=-1)
+
+
+@_metric('sac', 'sac_table')
+def _sac(sb, table):
+    return table.reshape(-1, 64).mean(axis=-1)
+
+
+@_metric('sac_pass', 'sac_table')
+def _sac_pass(sb, table):
+    per_bit = table.sum(axis=-1)
+    return np.all((per_bit >= 3.0) & (per_bit <= 5.0), axis=-1)
+
+
+@_metric('du', 'ddt')
+def _du(sb, table):
+    return table[:, 1:].max(axis=(1, 2))
+
+
+@_metric('dap', 'du')
+def _dap(sb, du):
+    return du / 256
+
+
+@_metric('diff_spectrum', 'ddt')
+def _diff_spectrum(sb, table):
+    return [sbox_tables.differential_spectrum(t) for t in table]
+
+
+@_metric('nl', 'walsh')
+def _nl(sb, walsh):
+    return sbox_tables.N // 2 - np.abs(walsh[:, 1:]).max(axis=(1, 2)) // 2
+
+
+@_metric('lap', 'walsh')
+def _lap(sb, walsh):
+    return np.abs(walsh[:, 1:, 1:]).max(axis=(1, 2)) // 2
+
+
+@_metric('max_bias', 'lap')
+def _max_bias(sb, lap):
+    return lap / 256
+
+
+@_metric('linear_spectrum', 'walsh')
+def _linear_spectrum(sb, walsh):
+    return [sbox_tables.linear_spectrum(sbox_tables.lat(None, w)) for w in walsh]
+
+
+@_metric('bic_nl', 'walsh')
+def _bic_nl(sb, walsh):
+    return sbox_tables.bic_nonlinearity(walsh).min(axis=-1)
+
+
+@_metric('bic_sac', 'bic_tables')
+def _bic_sac(sb, tables):
+    return tables[0].reshape(tables[0].shape[0], -1).mean(axis=-1)
+
+
+@_metric('alg_deg', 'coord_degrees')
+def _alg_deg(sb, degrees):
+    return degrees.max(axis=-1)
+
+
+@_metric('to', 'transparency')
+def _to(sb, transparency):
+    return transparency[0]
+
+
+@_metric('to_original', 'transparency')
+def _to_original(sb, transparency):
+    return transparency[1]
+
+
+@_metric('bu', 'bijective')
+def _bu(sb, bijective):
+    """Boomerang uniformity; -1 untuk row yang tidak bijektif"""
+    out = np.full(sb.shape[0], -1, dtype=np.int64)
+    if bijective.any():
+        out[bijective] = sbox_tables.bct(sb[bijective])[:, 1:, 1:].max(axis=(1, 2))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Threshold
+# ---------------------------------------------------------------------------
+
+# Parameter threshold -> (metric, jenis); 'tol' berarti |nilai - 0.5| <= threshold
+THRESHOLDS = {
+    'min_nl': ('nl', 'min'),
+    'max_du': ('du', 'max'),
+    'max_lap': ('lap', 'max'),
+    'max_bu': ('bu', 'max'),
+    'min_bic_nl': ('bic_nl', 'min'),
+    'min_alg_deg': ('alg_deg', 'min'),
+    'sac_tol': ('sac', 'tol'),
+    'bic_sac_tol': ('bic_sac', 'tol'),
+    'max_to': ('to', 'max'),
+}
+
+def parse_thresholds(params, allowed=None):
+    """Ambil threshold numerik dari mapping (mis. request.args); raise ValueError jika bukan angka"""
+    allowed = THRESHOLDS if allowed is None else allowed
+    out = {}
+    for key in allowed:
+        raw = params.get(key)
+        if raw is None or raw == '':
+            continue
+        try:
+            out[key] = float(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"Threshold {key} harus angka, diterima '{raw}'")
+    return out
+
+
+def passes(values, kind, limit):
+    """Cek threshold untuk nilai skalar atau array"""
+    values = np.asarray(values, dtype=np.float64)
+    if kind == 'min':
+        return values >= limit
+    if kind == 'max':
+        return values <= limit
+    return np.abs(values - 0.5) <= limit
+
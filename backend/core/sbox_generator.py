@@ -1,31 +1,45 @@
-from core.field_gf256 import gf_inverse
-from core.affine import affine_transform, affine_transform_custom
+from core.field_gf256 import IRREDUCIBLE_POLYS, all_inverse_tables, format_poly, inverse_table
+from core.power_maps import power_sboxes
+from core.affine import AES_MATRIX, C_BYTE, affine_map
 import numpy as np
 
 def generate_sbox():
-    sbox = []
-    for x in range(256):
-        inv = gf_inverse(x)
-        val = affine_transform(inv)
-        sbox.append(int(val))   # ⬅ ubah numpy.int64 → int
-    return sbox
+    return affine_map(inverse_table(), AES_MATRIX, C_BYTE).tolist()  # tolist -> int Python
 
 
-def generate_sbox_from_matrix(matrix_list, constant_hex):
+def parse_constant(constant_hex):
+    """Konstanta affine dari hex string ('63') atau integer; raise ValueError jika di luar 0..FF"""
+    value = int(constant_hex, 16) if isinstance(constant_hex, str) else int(constant_hex)
+    if not 0 <= value <= 0xFF:
+        raise ValueError(f"Konstanta harus 1 byte (00..FF), diterima '{constant_hex}'")
+    return value
+
+
+def generate_sbox_from_matrix(matrix_list, constant_hex, poly=None):
     """
     Generate S-box from custom matrix and constant
     matrix_list: 8x8 array (list of lists) with 0/1 values
     constant_hex: hex string like '63' or integer
+    poly: irreducible polynomial (int atau hex string), default 0x11B
     """
     matrix = np.array(matrix_list, dtype=int)
-    if isinstance(constant_hex, str):
-        constant = int(constant_hex, 16)
-    else:
-        constant = int(constant_hex)
-    
-    sbox = []
-    for x in range(256):
-        inv = gf_inverse(x)
-        val = affine_transform_custom(inv, matrix, constant)
-        sbox.append(int(val))
-    return sbox
+    return affine_map(inverse_table(poly), matrix, parse_constant(constant_hex)).tolist()
+
+
+def generate_sbox_all_polys(matrix_list, constant_hex):
+    """
+    Matriks + konstanta yang sama di atas inverse semua 30 polynomial sekaligus.
+    Return list (poly hex, S-box) urut registry.
+    """
+    matrix = np.array(matrix_list, dtype=int)
+    sboxes = affine_map(all_inverse_tables(), matrix, parse_constant(constant_hex))
+    return [(format_poly(p), s.tolist()) for p, s in zip(IRREDUCIBLE_POLYS, sboxes)]
+
+
+def generate_power_sbox(d, matrix_list=None, constant_hex=0, poly=None):
+    """
+    Power mapping S-box x^d (gcd(d, 255) = 1), opsional diikuti stage affine
+    A·x^d ^ c. d = 254 dengan matriks/konstanta AES = S-box AES.
+    """
+    matrix = None if matrix_list is None else np.array(matrix_list, dtype=int)
+    return power_sboxes([d], poly, matrix, parse_constant(constant_hex))[0].tolist()
@@ -0,0 +1,296 @@
+# kernel NumPy untuk tabel turunan S-box (DDT, LAT, ANF, bit-plane)
+#
+# Semua fungsi menerima S-box sebagai array uint8 256 entry dan tidak
+# menyimpan state; caching dilakukan oleh core.sbox.SBox. Kernel juga
+# menerima tumpukan S-box (..., 256) dan menghitung per row (dipakai oleh
+# core.sbox_batch).
+import numpy as np
+
+N = 256
+N_BITS = 8
+
+_X = np.arange(N, dtype=np.uint8)
+
+_POPCOUNT = np.array([bin(v).count('1') for v in range(N)], dtype=np.uint8)
+_POPCOUNT.setflags(write=False)
+
+
+def popcount(values):
+    """Hamming weight per byte (tabel lookup, aman untuk numpy lama)"""
+    return _POPCOUNT[np.asarray(values, dtype=np.uint8)]
+
+
+def bit_planes(sbox):
+    """Matriks komponen bit (8, 256): row i = bit i dari S(x)"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    return (sbox[..., None, :] >> np.arange(N_BITS, dtype=np.uint8)[:, None]) & 1
+
+
+def is_permutation(sbox):
+    """Cek bijektif per row (..., 256) tanpa loop Python"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    return np.all(np.sort(sbox, axis=-1) == _X, axis=-1)
+
+
+def inverse_sbox(sbox):
+    """Inverse permutasi per row (..., 256); raise ValueError jika ada row yang tidak bijektif"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    if not np.all(is_permutation(sbox)):
+        raise ValueError("S-box tidak bijektif, inverse tidak ada")
+    return np.argsort(sbox, axis=-1).astype(np.uint8)  # permutasi: posisi nilai y = S^-1(y)
+
+
+_XOR = _X[:, None] ^ _X[None, :]
+
+
+def _stack(sbox):
+    """(..., 256) -> (M, 256) uint8 plus shape leading axes"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    return sbox.reshape(-1, N), sbox.shape[:-1]
+
+
+def ddt(sbox):
+    """Difference distribution table: DDT[dx, dy] = #{x : S(x) ^ S(x ^ dx) = dy}"""
+    sb, lead = _stack(sbox)
+    dy = sb[:, _XOR] ^ sb[:, None, :]  # dy[m, dx, x]
+    base = (np.arange(sb.shape[0], dtype=np.int64)[:, None, None] << 16) | \
+        (np.arange(N, dtype=np.int64)[None, :, None] << 8)
+    counts = np.bincount((base | dy).ravel(), minlength=sb.shape[0] * N * N)
+    return counts.reshape(lead + (N, N))
+
+
+def avalanche_diffs(sbox):
+    """S(x) ^ S(x ^ e_i) untuk semua bit input i: (8, 256)"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    flips = _X[None, :] ^ (np.uint8(1) << np.arange(N_BITS, dtype=np.uint8))[:, None]
+    return sbox[..., flips] ^ sbox[..., None, :]
+
+
+def avalanche_planes(diffs):
+    """Bit-plane avalanche (8 input bit i, 8 output bit j, 256 x) sebagai float 0/1"""
+    return ((diffs[..., None, :] >> np.arange(N_BITS, dtype=np.uint8)[:, None]) & 1).astype(np.float64)
+
+
+def sac_matrix(planes):
+    """Matriks SAC 8x8: M[i, j] = P(bit output j berubah | bit input i di-flip)"""
+    return planes.mean(axis=-1)
+
+
+# Semua 28 pasangan bit output (i < j)
+BIT_PAIRS = [(i, j) for i in range(N_BITS) for j in range(i + 1, N_BITS)]
+PAIR_I = np.array([p[0] for p in BIT_PAIRS])
+PAIR_J = np.array([p[1] for p in BIT_PAIRS])
+PAIR_MASKS = (1 << PAIR_I) | (1 << PAIR_J)
+
+
+def bic_nonlinearity(walsh):
+    """NL dari S_i XOR S_j untuk ke-28 pasangan, dibaca langsung dari Walsh spectrum"""
+    return N // 2 - np.abs(walsh[..., PAIR_MASKS, :]).max(axis=-1) // 2
+
+
+def bic_sac_tables(planes):
+    """
+    BIC-SAC dalam satu pass atas bit-plane avalanche (8 input, 8 output, 256 x).
+
+    Return (flip, corr), masing-masing shape (..., 8 input bit, 28 pasangan):
+    flip = P(bit i XOR bit j berubah), corr = korelasi variabel avalanche i dan j.
+    """
+    p = sac_matrix(planes)                                        # (..., 8, 8)
+    gram = planes @ np.swapaxes(planes, -1, -2) / N               # (..., 8, 8, 8): E[b_i b_j]
+    pi, pj = p[..., PAIR_I], p[..., PAIR_J]
+    joint = gram[..., PAIR_I, PAIR_J]
+    flip = pi + pj - 2 * joint
+    denom = np.sqrt(pi * (1 - pi) * pj * (1 - pj))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.where(denom > 0, (joint - pi * pj) / denom, 0.0)
+    return flip, corr
+
+
+def bct(sbox):
+    """
+    Boomerang connectivity table:
+    BCT[a, b] = #{x : S^-1(S(x) ^ b) ^ S^-1(S(x ^ a) ^ b) = a}.
+
+    Tanpa enumerasi 2^24: dengan u = S^-1(S(x) ^ b), syarat di atas setara
+    dengan x dan u berada di kelas yang sama {z : S(z) ^ S(z ^ a) = g}. Jadi
+    BCT[a, b] = jumlah pasangan terurut (x, u) satu kelas dengan S(x) ^ S(u) = b.
+    Kelas diurutkan per row a, lalu pasangan dalam kelas diambil dengan shift
+    k = 1, 2, ... (maksimal DU - 1 shift). Memori tetap O(256 x 256) per S-box.
+    S-box harus bijektif.
+    """
+    sb, lead = _stack(sbox)
+    if not is_permutation(sb).all():
+        raise ValueError("BCT hanya terdefinisi untuk S-box bijektif")
+    m = sb.shape[0]
+    gamma = sb[:, _XOR[1:]] ^ sb[:, None, :]                      # (M, 255, 256)
+    # Sort key uint16 (gamma << 8 | S(x)): unik karena S bijektif, jadi sekali sort
+    # memberi kelas sekaligus nilai S anggotanya
+    keys = np.sort((gamma.astype(np.uint16) << 8) | sb[:, None, :], axis=-1)
+    g_sorted = keys >> 8
+    s_sorted = (keys & 0xFF).astype(np.uint8)
+    row_base = (np.arange(m, dtype=np.int64)[:, None, None] << 16) | \
+        (np.arange(1, N, dtype=np.int64)[None, :, None] << 8)
+
+    idx = []
+    k = 1
+    while k < N:
+        same = g_sorted[..., k:] == g_sorted[..., :-k]
+        if not same.any():
+            break
+        b = s_sorted[..., k:] ^ s_sorted[..., :-k]
+        idx.append(np.broadcast_to(row_base, b.shape)[same] | b[same])
+        k += 1
+    # (x, u) dan (u, x)
+    counts = 2 * np.bincount(np.concatenate(idx) if idx else np.zeros(0, dtype=np.int64),
+                             minlength=m * N * N)
+
+    table = counts.reshape(m, N, N)
+    table[:, :, 0] = N  # u = x selalu memenuhi
+    table[:, 0, :] = N  # a = 0: semua x memenuhi
+    return table.reshape(lead + (N, N))
+
+
+def boomerang_spectrum(bct_table):
+    """Histogram entry BCT untuk a, b != 0"""
+    counts = np.bincount(bct_table[1:, 1:].ravel())
+    return {int(v): int(c) for v, c in enumerate(counts) if c}
+
+
+def differential_spectrum(ddt_table):
+    """Histogram entry DDT untuk dx != 0: {nilai entry: jumlah kemunculan}"""
+    counts = np.bincount(ddt_table[1:].ravel())
+    return {int(v): int(c) for v, c in enumerate(counts) if c}
+
+
+def fwht(values, axis=-1):
+    """
+    Fast Walsh-Hadamard Transform (tanpa normalisasi) di axis tertentu.
+    8 tahap butterfly, vectorized atas semua axis lain.
+    """
+    a = np.moveaxis(np.array(values, dtype=np.int32, copy=True), axis, -1)
+    lead = a.shape[:-1]
+    for k in range(N_BITS):
+        step = 1 << k
+        view = a.reshape(lead + (N // (2 * step), 2, step))
+        lo = view[..., 0, :].copy()
+        hi = view[..., 1, :]
+        view[..., 0, :] += hi
+        view[..., 1, :] = lo - hi
+    return np.moveaxis(a, -1, axis)
+
+
+def component_signs(sbox):
+    """(-1)^(b·S(x)) untuk semua 256 component function: (256 b, 256 x)"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    parity = (_POPCOUNT[_X[:, None] & sbox[..., None, :]] & 1).astype(np.int32)
+    return 1 - 2 * parity
+
+
+# Matriks Hadamard H[x, a] = (-1)^(a·x) dan tabel (-1)^wt(v); float32 eksak untuk |W| <= 256
+_HADAMARD = fwht(np.eye(N, dtype=np.int32)).astype(np.float32)
+_SIGN_F32 = (1 - 2 * (_POPCOUNT & 1).astype(np.int32)).astype(np.float32)
+for _table in (_HADAMARD, _SIGN_F32):
+    _table.setflags(write=False)
+
+
+def walsh_spectrum(sbox):
+    """
+    Walsh spectrum W[b, a] = sum_x (-1)^(b·S(x) ^ a·x), semua 255 component sekaligus.
+    Dihitung sebagai signs @ H (BLAS) - hasil sama dengan fwht tapi jauh lebih cepat
+    untuk tumpukan S-box.
+    """
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    return (_SIGN_F32[_X[:, None] & sbox[..., None, :]] @ _HADAMARD).astype(np.int32)
+
+
+def lat(sbox, walsh=None):
+    """Linear approximation table: LAT[a, b] = #{x : a·x = b·S(x)} - 128"""
+    if walsh is None:
+        walsh = walsh_spectrum(sbox)
+    return np.swapaxes(walsh, -1, -2) // 2
+
+
+def autocorrelation(walsh_rows):
+    """
+    Autocorrelation A_f(a) = sum_x (-1)^(f(x) ^ f(x ^ a)) dari Walsh spectrum:
+    A_f = FWHT(W_f^2) / 256 (Wiener-Khinchin), untuk setiap row sekaligus.
+    """
+    w = np.asarray(walsh_rows, dtype=np.int64)
+    return fwht(w * w, axis=-1) // N
+
+
+def autocorrelation_spectrum(act_table):
+    """Histogram |ACT[b, a]| untuk b, a != 0"""
+    counts = np.bincount(np.abs(act_table[1:, 1:]).ravel())
+    return {int(v): int(c) for v, c in enumerate(counts) if c}
+
+
+# (-1)^beta_i untuk semua 256 mask beta: (256, 8)
+_BETA_SIGNS = 1 - 2 * ((_X[:, None] >> np.arange(N_BITS, dtype=np.uint8)[None, :]) & 1).astype(np.int64)
+
+
+def transparency_order(coord_autocorr):
+    """
+    Transparency order dari autocorrelation 8 coordinate function (8, 256).
+
+    Return (revised, original):
+      revised  = max_b ( m - 1/(2^2n - 2^n) sum_{a!=0} |sum_i (-1)^b_i A_i(a)| )
+      original = max_b ( |m - 2 wt(b)| - (suku yang sama) )   [Prouff 2005]
+    Semua 256 mask b dihitung dengan satu perkalian matriks (256x8 @ 8x256).
+    """
+    revised, original = transparency_profile(coord_autocorr)
+    return float(revised), float(original)
+
+
+def transparency_profile(coord_autocorr):
+    """transparency_order per S-box untuk tumpukan autocorrelation (..., 8, 256)"""
+    # float32 matmul (BLAS) eksak karena |entry| <= 8 * 256; penjumlahan di float64
+    mixed = _BETA_SIGNS.astype(np.float32) @ np.asarray(coord_autocorr, dtype=np.float32)  # (..., 256 b, 256 a)
+    penalty = np.abs(mixed[..., 1:]).sum(axis=-1, dtype=np.float64) / (N * N - N)
+    revised = N_BITS - penalty
+    original = np.abs(N_BITS - 2 * _POPCOUNT.astype(np.int64)) - penalty
+    return revised.max(axis=-1), original.max(axis=-1)
+
+
+def linear_spectrum(lat_table):
+    """Histogram |LAT[a, b]| untuk a, b != 0: {nilai absolut: jumlah kemunculan}"""
+    counts = np.bincount(np.abs(lat_table[1:, 1:]).ravel())
+    return {int(v): int(c) for v, c in enumerate(counts) if c}
+
+
+def nonlinearity(walsh):
+    """
+    NL eksak dari Walsh spectrum (..., 256, 256): 128 - max|W| / 2 atas
+    component b != 0. int untuk satu S-box, array per row untuk tumpukan.
+    """
+    peak = np.abs(np.asarray(walsh)[..., 1:, :]).max(axis=(-2, -1))
+    nl = N // 2 - peak.astype(np.int64) // 2
+    return int(nl) if nl.ndim == 0 else nl
+
+
+def moebius(truth_tables):
+    """Binary Möbius transform (truth table <-> ANF) di axis terakhir"""
+    f = np.array(truth_tables, dtype=np.uint8, copy=True)
+    lead = f.shape[:-1]
+    for k in range(N_BITS):
+        step = 1 << k
+        view = f.reshape(lead + (N // (2 * step), 2, step))
+        view[..., 1, :] ^= view[..., 0, :]
+    return f
+
+
+def anf(sbox):
+    """Koefisien ANF (8, 256) tiap coordinate function; kolom u = monomial x^u"""
+    return moebius(bit_planes(sbox))
+
+
+def component_anf(sbox):
+    """Koefisien ANF untuk semua 256 component function b·S (row 0 = fungsi nol)"""
+    sbox = np.asarray(sbox, dtype=np.uint8)
+    return moebius(_POPCOUNT[_X[:, None] & sbox[..., None, :]] & 1)
+
+
+def algebraic_degrees(anf_table):
+    """Derajat aljabar per row ANF = max weight monomial dengan koefisien 1 (fungsi nol -> 0)"""
+    weights = np.where(anf_table != 0, _POPCOUNT[None, :], 0)
+    return weights.max(axis=-1)
@@ -1,6 +1,14 @@
 import numpy as np
 from itertools import product
 import pandas as pd
+from core.sbox import SBox
+from core.sbox_analysis import analyze_sbox, resolve
+
+
+def _as_sbox(sbox):
+    return sbox if isinstance(sbox, SBox) else SBox(sbox)
+
+
 # Cek bijective
 def is_bijective(sbox):
     return sorted(sbox) == list(range(256))
@@ -13,65 +21,22 @@ def is_balanced(sbox):
 
 # Cek SAC (relaxed: rata-rata per bit input sekitar 4)
 def check_sac(sbox, lower=3.0, upper=5.0):
-    n = 256
-    for i in range(8):
-        total_ones = 0
-        for x in range(n):
-            flipped = x ^ (1 << i)
-            diff = sbox[x] ^ sbox[flipped]
-            total_ones += bin(diff).count("1")
-        avg = total_ones / n  # ideal ~4
-        if not (lower <= avg <= upper):
-            return False
-    return True
+    per_bit = resolve(_as_sbox(sbox), 'avalanche_per_bit')  # dari matriks SAC 8x8
+    return bool(np.all((per_bit >= lower) & (per_bit <= upper)))
 
 
 def calculate_sac_value(sbox):
     """Calculate actual SAC value (average proportion of changed bits)"""
-    n = 256
-    total_proportion = 0
-    for i in range(8):
-        total_ones = 0
-        for x in range(n):
-            flipped = x ^ (1 << i)
-            diff = sbox[x] ^ sbox[flipped]
-            total_ones += bin(diff).count("1")
-        proportion = total_ones / (n * 8)  # proportion of bits changed
-        total_proportion += proportion
-    return total_proportion / 8  # average over all input bits
+    return analyze_sbox(sbox, ['sac'])['sac']
 
-# Differential Uniformity
+# Differential Uniformity (DDT NumPy: satu broadcast XOR + bincount, di-cache)
 def differential_uniformity(sbox):
-    n = 256
-    max_count = 0
-    for dx in range(1, n):
-        counter = {}
-        for x in range(n):
-            dy = sbox[x] ^ sbox[x ^ dx]
-            counter[dy] = counter.get(dy, 0) + 1
-        max_count = max(max_count, max(counter.values()))
-    return max_count
+    return analyze_sbox(sbox, ['du'])['du']
 
-# Nonlinearity (optimized - simplified approximation)
+# Nonlinearity eksak: FWHT atas semua 255 component function
 def nonlinearity(sbox):
-    """Fast approximation: check first 32 masks instead of all 255"""
-    n = 256
-    min_nl = 128
-    
-    # Sample masks untuk speed (full calculation 255 masks = slow)
-    sample_masks = [1, 2, 4, 8, 16, 32, 64, 128, 3, 5, 9, 17, 33, 65, 129, 255,
-                    7, 15, 31, 63, 127, 85, 170, 204, 153, 102, 51, 105, 210, 45, 90, 180]
-    
-    for mask in sample_masks:
-        walsh_sum = 0
-        for x in range(n):
-            fx = bin(sbox[x]).count('1') % 2
-            ux = bin(x & mask).count('1') % 2
-            walsh_sum += (-1)**(fx ^ ux)
-        nl = (n - abs(walsh_sum)) // 2
-        min_nl = min(min_nl, nl)
-    
-    return min_nl
+    """Exact NL = 128 - max|W| / 2 over all components b != 0 (Walsh spectrum via engine)"""
+    return analyze_sbox(sbox, ['nl'])['nl']
 
 
 
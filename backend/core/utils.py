@@ -1,5 +1,8 @@
 import numpy as np
 
+from core.sbox import SBox
+from core.sbox_analysis import resolve
+
 
 def allowed_file(filename: str, allowed_ext) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_ext
@@ -15,12 +18,6 @@ def hamming(a, b):
 
 
 def avalanche_test(flat, flip_bit=0):
-    arr = np.array(flat, dtype=np.uint8)
-    total = 0
-    n = 256
-    for x in range(n):
-        y = x ^ (1 << flip_bit)
-        s1 = int(arr[x])
-        s2 = int(arr[y])
-        total += hamming(s1, s2)
-    return float(total) / n
+    """Rata-rata bit output berubah saat bit input flip_bit di-flip (row matriks SAC)"""
+    sbox = flat if isinstance(flat, SBox) else SBox(flat)
+    return float(resolve(sbox, 'avalanche_per_bit')[flip_bit])
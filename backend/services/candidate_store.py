@@ -0,0 +1,291 @@
+# penyimpanan kandidat explorer di SQLite lokal
+#
+# Key kandidat = SHA-256 isi S-box (256 byte), jadi kandidat yang sama dari
+# run berbeda hanya disimpan sekali (kolom `seen` menghitung berapa kali
+# ditemukan). Matriks (8 row ter-pack), konstanta dan S-box disimpan sebagai
+# blob; metric yang dipakai filter/urutan punya kolom + index sendiri.
+#
+# Tabel `runs` menyimpan hasil run explorer yang deterministik (parameter ->
+# daftar hash ter-ranking), sehingga request yang sama dijawab dari database.
+# `run_prefixes` mengelompokkan run yang hanya berbeda jumlah kandidat (base
+# key + n): run kecil bisa menjadi awal run yang lebih besar (lihat load_prefix_run).
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from core.affine import bits_to_byte
+from core.field_gf256 import format_poly
+from core.gf2_linalg import pack_matrix, unpack_matrix
+from core.matrix_explorer import EXPLORER_THRESHOLDS
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'outputs', 'candidates.sqlite')
+
+# Threshold metric explorer -> ekspresi kolom
+_METRIC_COLUMNS = {
+    'nl': 'nonlinearity',
+    'du': 'diff_uniformity',
+    'lap': 'lap',
+    'bu': 'boomerang_uniformity',
+    'bic_nl': 'bic_nl',
+    'alg_deg': 'alg_deg',
+    'sac': 'sac_value',
+    'bic_sac': 'bic_sac',
+    'to': 'transparency_order',
+    'fixed_points': '(fixed_points + opposite_fixed_points)',
+}
+
+# Urutan query yang diizinkan; 'rank' sama dengan matrix_explorer.rank_key
+ORDERS = {
+    'rank': ('nonlinearity DESC, diff_uniformity, boomerang_uniformity, sac DESC, '
+             '(fixed_points + opposite_fixed_points), transparency_order, sac_dist_max, hash'),
+    'nonlinearity': 'nonlinearity', 'diff_uniformity': 'diff_uniformity', 'lap': 'lap',
+    'boomerang_uniformity': 'boomerang_uniformity', 'sac_value': 'sac_value',
+    'sac_dist_max': 'sac_dist_max', 'bic_nl': 'bic_nl', 'bic_sac': 'bic_sac', 'alg_deg': 'alg_deg',
+    'transparency_order': 'transparency_order',
+    'fixed_points': '(fixed_points + opposite_fixed_points)',
+    'seen': 'seen', 'created_at': 'created_at',
+}
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS candidates (
+    hash TEXT PRIMARY KEY,
+    poly INTEGER NOT NULL,
+    matrix BLOB NOT NULL,
+    constant BLOB NOT NULL,
+    sbox BLOB NOT NULL,
+    bijective INTEGER, balanced INTEGER,
+    sac INTEGER, sac_value REAL, sac_dist_max REAL,
+    diff_uniformity INTEGER, nonlinearity INTEGER, lap INTEGER,
+    bic_nl INTEGER, bic_sac REAL, alg_deg INTEGER,
+    transparency_order REAL, boomerang_uniformity INTEGER,
+    fixed_points INTEGER, opposite_fixed_points INTEGER, free_constants INTEGER,
+    source TEXT, seen INTEGER NOT NULL DEFAULT 1,
+    created_at REAL NOT NULL, last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_candidates_nl ON candidates (nonlinearity);
+CREATE INDEX IF NOT EXISTS idx_candidates_du ON candidates (diff_uniformity);
+CREATE INDEX IF NOT EXISTS idx_candidates_bu ON candidates (boomerang_uniformity);
+CREATE INDEX IF NOT EXISTS idx_candidates_sac_dist ON candidates (sac_dist_max);
+CREATE INDEX IF NOT EXISTS idx_candidates_bic_nl ON candidates (bic_nl);
+CREATE INDEX IF NOT EXISTS idx_candidates_to ON candidates (transparency_order);
+CREATE INDEX IF NOT EXISTS idx_candidates_poly ON candidates (poly);
+CREATE TABLE IF NOT EXISTS runs (
+    key TEXT PRIMARY KEY,
+    top_k INTEGER,
+    meta TEXT NOT NULL,
+    items TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_prefixes (
+    base TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (base, size)
+);
+'''
+
+_INITIALIZED = set()
+_INIT_LOCK = threading.Lock()
+
+
+@contextmanager
+def _connect(db_path=None):
+    """Koneksi per operasi (aman untuk thread/process); commit lalu close"""
+    path = db_path or DB_PATH
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        if path not in _INITIALIZED:
+            with _INIT_LOCK:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(_SCHEMA)
+                _INITIALIZED.add(path)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def sbox_hash(sbox):
+    """SHA-256 (hex) dari 256 byte S-box"""
+    return hashlib.sha256(bytes(np.asarray(sbox, dtype=np.uint8).reshape(256))).hexdigest()
+
+
+def _row_values(record, source, now):
+    return (
+        sbox_hash(record['sbox']), int(record['poly'], 16),
+        pack_matrix(record['matrix']).tobytes(), bytes([int(bits_to_byte(record['constant']))]),
+        bytes(np.asarray(record['sbox'], dtype=np.uint8)),
+        int(record['bijective']), int(record['balanced']),
+        int(record['sac']), record['sac_value'], record['sac_dist_max'],
+        record['diff_uniformity'], record['nonlinearity'], record['lap'],
+        record['bic_nl'], record['bic_sac'], record['alg_deg'],
+        record['transparency_order'], record['boomerang_uniformity'],
+        record['fixed_points'], record['opposite_fixed_points'], record['free_constants'],
+        source, now, now,
+    )
+
+
+def save_candidates(records, source=None, db_path=None):
+    """
+    Simpan kandidat explorer (format candidate_records); kandidat yang sudah
+    ada hanya menaikkan `seen`. Return list hash sesuai urutan records.
+    """
+    now = time.time()
+    rows = [_row_values(r, source, now) for r in records]
+    with _connect(db_path) as conn:
+        conn.executemany(
+            'INSERT INTO candidates (hash, poly, matrix, constant, sbox, bijective, balanced, sac, sac_value, '
+            'sac_dist_max, diff_uniformity, nonlinearity, lap, bic_nl, bic_sac, alg_deg, transparency_order, '
+            'boomerang_uniformity, fixed_points, opposite_fixed_points, free_constants, source, created_at, '
+            'last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(hash) DO UPDATE SET seen = seen + 1, last_seen = excluded.last_seen', rows)
+    return [row[0] for row in rows]
+
+
+def _record(row):
+    """Row database -> dict kandidat (format explorer + hash/source/seen)"""
+    constant = row['constant'][0]
+    return {
+        'hash': row['hash'],
+        'poly': format_poly(row['poly']),
+        'matrix': unpack_matrix(np.frombuffer(row['matrix'], dtype=np.uint8)).tolist(),
+        'constant': [constant >> b & 1 for b in range(8)],
+        'sbox': list(row['sbox']),
+        'bijective': bool(row['bijective']),
+        'balanced': bool(row['balanced']),
+        'sac': bool(row['sac']),
+        'sac_value': row['sac_value'],
+        'sac_dist_max': row['sac_dist_max'],
+        'diff_uniformity': row['diff_uniformity'],
+        'nonlinearity': row['nonlinearity'],
+        'lap': row['lap'],
+        'bic_nl': row['bic_nl'],
+        'bic_sac': row['bic_sac'],
+        'alg_deg': row['alg_deg'],
+        'transparency_order': row['transparency_order'],
+        'boomerang_uniformity': row['boomerang_uniformity'],
+        'fixed_points': row['fixed_points'],
+        'opposite_fixed_points': row['opposite_fixed_points'],
+        'free_constants': row['free_constants'],
+        'source': row['source'],
+        'seen': row['seen'],
+    }
+
+
+def get_candidates(hashes, db_path=None):
+    """Ambil kandidat per hash; return dict hash -> record (hash yang tidak ada dilewati)"""
+    hashes = list(hashes)
+    out = {}
+    with _connect(db_path) as conn:
+        for start in range(0, len(hashes), 500):  # batas parameter SQLite
+            part = hashes[start:start + 500]
+            rows = conn.execute(f"SELECT * FROM candidates WHERE hash IN ({', '.join('?' * len(part))})", part)
+            out.update((row['hash'], _record(row)) for row in rows)
+    return out
+
+
+def get_candidate(h, db_path=None):
+    """Satu kandidat (lookup primary key), None jika tidak ada"""
+    return get_candidates([h], db_path).get(h)
+
+
+def query_candidates(thresholds=None, order='rank', descending=False, limit=50, offset=0,
+                     poly=None, db_path=None):
+    """
+    Cari kandidat tersimpan dengan threshold explorer ({parameter: batas},
+    lihat EXPLORER_THRESHOLDS), urutan dari ORDERS dan pagination.
+    descending hanya berlaku untuk urutan kolom ('rank' selalu terbaik dulu).
+    Return (jumlah total yang cocok, list record halaman ini).
+    """
+    if order not in ORDERS:
+        raise ValueError(f"Urutan tidak dikenal: {order}")
+    where, params = [], []
+    for key, limit_value in (thresholds or {}).items():
+        metric, kind = EXPLORER_THRESHOLDS[key]
+        column = _METRIC_COLUMNS[metric]
+        if kind == 'min':
+            where.append(f'{column} >= ?')
+        elif kind == 'max':
+            where.append(f'{column} <= ?')
+        else:
+            where.append(f'ABS({column} - 0.5) <= ?')
+        params.append(limit_value)
+    if poly is not None:
+        where.append('poly = ?')
+        params.append(int(poly))
+    clause = f" WHERE {' AND '.join(where)}" if where else ''
+    order_by = ORDERS[order]
+    if order != 'rank':
+        order_by = f"{order_by} {'DESC' if descending else 'ASC'}, hash"
+
+    with _connect(db_path) as conn:
+        total = conn.execute(f'SELECT COUNT(*) FROM candidates{clause}', params).fetchone()[0]
+        rows = conn.execute(f'SELECT * FROM candidates{clause} ORDER BY {order_by} LIMIT ? OFFSET ?',
+                            params + [max(int(limit), 0), max(int(offset), 0)]).fetchall()
+    return total, [_record(row) for row in rows]
+
+
+def run_key(params):
+    """Key run dari parameter (dict JSON-safe); urutan key tidak berpengaruh"""
+    return json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+
+def save_run(key, top_k, meta, records, prefix=None, db_path=None):
+    """
+    Simpan hasil run (meta response + kandidat ter-ranking). Field per run
+    selain metric kandidat (id, objective_score) disimpan di daftar items.
+    prefix opsional (base key, jumlah kandidat) mendaftarkan run untuk load_prefix_run.
+    """
+    hashes = save_candidates(records, meta.get('strategy', 'random'), db_path)
+    items = [{'hash': h, **{k: r[k] for k in ('id', 'objective_score') if k in r}}
+             for h, r in zip(hashes, records)]
+    with _connect(db_path) as conn:
+        conn.execute('INSERT OR REPLACE INTO runs (key, top_k, meta, items, created_at) VALUES (?, ?, ?, ?, ?)',
+                     (key, top_k, json.dumps(meta), json.dumps(items), time.time()))
+        if prefix is not None:
+            conn.execute('INSERT OR REPLACE INTO run_prefixes (base, size, key) VALUES (?, ?, ?)',
+                         (prefix[0], int(prefix[1]), key))
+    return hashes
+
+
+def load_run(key, top_k=None, db_path=None):
+    """
+    Hasil run tersimpan untuk key, atau None. Run dengan top_k lebih besar
+    juga bisa dipakai karena top-k adalah prefix ranking yang sama.
+    Return (meta, records).
+    """
+    with _connect(db_path) as conn:
+        row = conn.execute('SELECT * FROM runs WHERE key = ?', (key,)).fetchone()
+    if row is None or (row['top_k'] is not None and (top_k is None or top_k > row['top_k'])):
+        return None
+    items = json.loads(row['items'])[:top_k]
+    found = get_candidates([item['hash'] for item in items], db_path)
+    if len(found) < len(set(item['hash'] for item in items)):
+        return None
+    records = [{**found[item['hash']], **{k: v for k, v in item.items() if k != 'hash'}} for item in items]
+    return json.loads(row['meta']), records
+
+
+def load_prefix_run(base, size, top_k=None, db_path=None):
+    """
+    Run tersimpan terbesar dengan base key yang sama dan jumlah kandidat <= size
+    (dengan top_k yang cukup). Hanya berguna jika kandidat run kecil adalah
+    prefix run besar; run besar tidak bisa menjawab run kecil karena hanya
+    top-k yang disimpan. Return (size run, meta, records) atau None.
+    """
+    with _connect(db_path) as conn:
+        rows = conn.execute('SELECT size, key FROM run_prefixes WHERE base = ? AND size <= ? ORDER BY size DESC',
+                            (base, int(size))).fetchall()
+    for row in rows:
+        found = load_run(row['key'], top_k, db_path)
+        if found is not None:
+            return (row['size'],) + found
+    return None
@@ -0,0 +1,292 @@
+# antrian job lokal untuk operasi panjang (explorer, batch export, analyze)
+#
+# Job disimpan di tabel SQLite (outputs/jobs.sqlite) dan dijalankan oleh pool
+# thread daemon di dalam proses web, tanpa broker eksternal. Worker mengambil
+# job 'queued' lewat UPDATE atomik, jadi beberapa proses (mis. worker
+# gunicorn) bisa berbagi tabel tanpa menjalankan job yang sama dua kali.
+# Cancel bersifat kooperatif: handler memanggil job.progress(), yang raise
+# JobCancelled begitu cancel diminta. Job 'running' milik proses yang sudah
+# mati (host:pid:start time di kolom worker) dikembalikan ke antrian secara
+# berkala oleh worker loop.
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'outputs', 'jobs.sqlite')
+WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+ORPHAN_INTERVAL = 30.0  # detik antar pengecekan job 'running' yang prosesnya sudah mati
+
+STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+FINISHED = ('done', 'failed', 'cancelled')
+
+JOB_HANDLERS = {}  # kind -> fn(params, job) -> result JSON-safe
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+'''
+
+_INITIALIZED = set()
+_LOCK = threading.Lock()
+_WAKE = threading.Event()
+_POOL = {'pid': None, 'threads': [], 'orphan_check': None}
+
+
+class JobCancelled(Exception):
+    """Dilempar dari JobContext.progress() saat cancel diminta"""
+
+
+def job_handler(kind):
+    """Daftarkan handler job: fn(params, job) -> result JSON-safe"""
+    def register(fn):
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+@contextmanager
+def _connect(db_path=None):
+    path = db_path or DB_PATH
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)  # transaksi eksplisit
+    conn.row_factory = sqlite3.Row
+    try:
+        if path not in _INITIALIZED:
+            with _LOCK:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(_SCHEMA)
+                _INITIALIZED.add(path)
+        yield conn
+    finally:
+        conn.close()
+
+
+def _process_token(pid):
+    """
+    Start time proses (clock tick sejak boot, /proc/<pid>/stat field 22) sebagai
+    pembeda PID yang dipakai ulang; '' jika /proc tidak tersedia
+    """
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rpartition(')')[2].split()[19]
+    except (OSError, IndexError):
+        return ''
+
+
+def _worker_name():
+    pid = os.getpid()
+    return f"{socket.gethostname()}:{pid}:{_process_token(pid)}"
+
+
+def _job_dict(row, with_result=False):
+    job = {
+        'id': row['id'],
+        'kind': row['kind'],
+        'status': row['status'],
+        'progress': row['progress'],
+        'message': row['message'],
+        'error': row['error'],
+        'cancel_requested': bool(row['cancel_requested']),
+        'created_at': row['created_at'],
+        'started_at': row['started_at'],
+        'finished_at': row['finished_at'],
+        'params': json.loads(row['params']),
+    }
+    if with_result:
+        job['result'] = json.loads(row['result']) if row['result'] is not None else None
+    return job
+
+
+class JobContext:
+    """Handle yang diterima handler untuk melaporkan progress dan cek cancel"""
+
+    def __init__(self, job_id, db_path=None):
+        self.id = job_id
+        self.db_path = db_path
+
+    def progress(self, fraction, message=None):
+        """Simpan progress (0..1); raise JobCancelled jika cancel sudah diminta"""
+        with _connect(self.db_path) as conn:
+            conn.execute('UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?',
+                         (min(max(float(fraction), 0.0), 1.0), message, self.id))
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (self.id,)).fetchone()
+        if row is not None and row['cancel_requested']:
+            raise JobCancelled()
+
+
+def new_job_id():
+    return uuid.uuid4().hex
+
+
+def submit(kind, params, db_path=None, job_id=None):
+    """
+    Masukkan job ke antrian; return id job. job_id bisa dibuat lebih dulu
+    (new_job_id) mis. untuk menamai file upload milik job. Worker pool
+    dijalankan jika belum.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Jenis job tidak dikenal: {kind}")
+    job_id = job_id or new_job_id()
+    with _connect(db_path) as conn:
+        conn.execute('INSERT INTO jobs (id, kind, params, status, created_at) VALUES (?, ?, ?, ?, ?)',
+                     (job_id, kind, json.dumps(params), 'queued', time.time()))
+    start_workers(db_path=db_path)
+    _WAKE.set()
+    return job_id
+
+
+def get_job(job_id, with_result=False, db_path=None):
+    """Status job (dict), None jika id tidak ada"""
+    with _connect(db_path) as conn:
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    return _job_dict(row, with_result) if row is not None else None
+
+
+def list_jobs(status=None, limit=50, db_path=None):
+    """Job terbaru dulu, opsional difilter status"""
+    query, params = 'SELECT * FROM jobs', []
+    if status is not None:
+        if status not in STATUSES:
+            raise ValueError(f"Status job tidak dikenal: {status}")
+        query += ' WHERE status = ?'
+        params.append(status)
+    with _connect(db_path) as conn:
+        rows = conn.execute(query + ' ORDER BY created_at DESC LIMIT ?', params + [int(limit)]).fetchall()
+    return [_job_dict(row) for row in rows]
+
+
+def cancel(job_id, db_path=None):
+    """
+    Batalkan job: yang masih queued langsung 'cancelled', yang running ditandai
+    dan berhenti di panggilan progress() berikutnya. Return status job, None jika tidak ada.
+    """
+    with _connect(db_path) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            conn.execute('COMMIT')
+            return None
+        status = row['status']
+        if status == 'queued':
+            status = 'cancelled'
+            conn.execute("UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ? WHERE id = ?",
+                         (time.time(), job_id))
+        elif status == 'running':
+            conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+        conn.execute('COMMIT')
+    return status
+
+
+def _claim(db_path=None):
+    """Ambil satu job queued tertua secara atomik; return row atau None"""
+    with _connect(db_path) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+        if row is not None:
+            conn.execute("UPDATE jobs SET status = 'running', worker = ?, started_at = ? WHERE id = ?",
+                         (_worker_name(), time.time(), row['id']))
+        conn.execute('COMMIT')
+    return row
+
+
+def _finish(job_id, status, result=None, error=None, db_path=None):
+    with _connect(db_path) as conn:
+        conn.execute('UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, '
+                     "progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END WHERE id = ?",
+                     (status, json.dumps(result) if result is not None else None, error, time.time(),
+                      status, job_id))
+
+
+def run_job(row, db_path=None):
+    """Jalankan satu job yang sudah di-claim dan simpan hasil/status akhirnya"""
+    job = JobContext(row['id'], db_path)
+    try:
+        job.progress(0.0)
+        result = JOB_HANDLERS[row['kind']](json.loads(row['params']), job)
+    except JobCancelled:
+        _finish(row['id'], 'cancelled', db_path=db_path)
+    except Exception as e:
+        traceback.print_exc()
+        _finish(row['id'], 'failed', error=str(e), db_path=db_path)
+    else:
+        _finish(row['id'], 'done', result, db_path=db_path)
+
+
+def _worker_loop(db_path):
+    while True:
+        _check_orphans(db_path)
+        row = _claim(db_path)
+        if row is None:
+            _WAKE.wait(timeout=1.0)
+            _WAKE.clear()
+            continue
+        run_job(row, db_path)
+
+
+def _pid_alive(pid, token=''):
+    """Proses pid masih hidup dan (jika token ada) start time-nya sama, bukan PID yang dipakai ulang"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return not token or _process_token(pid) in ('', token)
+
+
+def _requeue_orphans(db_path=None):
+    """Job 'running' milik proses di host ini yang sudah mati dikembalikan ke antrian"""
+    host = socket.gethostname()
+    with _connect(db_path) as conn:
+        rows = conn.execute("SELECT id, worker FROM jobs WHERE status = 'running'").fetchall()
+        for row in rows:
+            owner_host, pid, token = ((row['worker'] or '').split(':') + ['', ''])[:3]
+            if owner_host == host and pid.isdigit() and not _pid_alive(int(pid), token):
+                conn.execute("UPDATE jobs SET status = 'queued', worker = NULL, progress = 0 "
+                             "WHERE id = ? AND status = 'running'", (row['id'],))
+
+
+def _check_orphans(db_path=None):
+    """_requeue_orphans paling sering sekali per ORPHAN_INTERVAL per proses (dipanggil worker loop)"""
+    now = time.monotonic()
+    with _LOCK:
+        last = _POOL['orphan_check']
+        if last is not None and now - last < ORPHAN_INTERVAL:
+            return
+        _POOL['orphan_check'] = now
+    _requeue_orphans(db_path)
+
+
+def start_workers(n=None, db_path=None):
+    """Jalankan pool thread worker di proses ini (sekali per proses, aman setelah fork)"""
+    with _LOCK:
+        if _POOL['pid'] == os.getpid():
+            return
+        _POOL['pid'] = os.getpid()
+        _POOL['orphan_check'] = None
+    threads = []
+    for i in range(max(1, n or WORKERS)):
+        thread = threading.Thread(target=_worker_loop, args=(db_path,), name=f'job-worker-{i}', daemon=True)
+        thread.start()
+        threads.append(thread)
+    _POOL['threads'] = threads
@@ -0,0 +1,28 @@
+import pytest
+
+from app import _sbox_metrics, batch_score
+from core.field_gf256 import inverse_table
+
+
+def _rotl(b, k):
+    return ((b << k) | (b >> (8 - k))) & 0xFF
+
+
+def aes_sbox():
+    """S-box AES standar: inverse di GF(2^8)/0x11B lalu affine FIPS-197 (c = 0x63)"""
+    inv = inverse_table(0x11B)
+    return [int(b) ^ _rotl(b, 1) ^ _rotl(b, 2) ^ _rotl(b, 3) ^ _rotl(b, 4) ^ 0x63
+            for b in (int(v) for v in inv)]
+
+
+def test_batch_score_aes():
+    sbox = aes_sbox()
+    assert sbox[:4] == [0x63, 0x7C, 0x77, 0x7B]
+    metrics = _sbox_metrics(sbox)
+    assert metrics['tg'] == pytest.approx(7.8623, abs=1e-4)
+    assert batch_score(metrics) == pytest.approx(73.4542, abs=1e-3)
+
+
+def test_batch_score_lower_to_is_better():
+    metrics = {'nl': 112, 'sac': 0.5, 'bic_nl': 112, 'du': 4}
+    assert batch_score({**metrics, 'tg': 7.0}) > batch_score({**metrics, 'tg': 7.86})
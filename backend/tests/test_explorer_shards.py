@@ -0,0 +1,33 @@
+import os
+
+from app import app
+from core.matrix_explorer import explore_affine, merge_top
+from services import candidate_store
+
+# Lebih banyak partisi daripada core: hasil tidak boleh bergantung pada host
+WORKERS = (os.cpu_count() or 1) + 2
+
+
+def test_pooled_run_matches_serial():
+    serial = explore_affine(600, seed=1, workers=WORKERS, top_k=5, parallel=False)
+    pooled = explore_affine(600, seed=1, workers=WORKERS, top_k=5, parallel=True, max_procs=2)
+    assert [r['id'] for r in pooled['results']] == [r['id'] for r in serial['results']]
+    assert (pooled['passed'], pooled['workers']) == (serial['passed'], WORKERS)
+
+
+def test_endpoint_keeps_requested_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_store, 'DB_PATH', str(tmp_path / 'candidates.sqlite'))
+    serial = explore_affine(600, seed=1, workers=WORKERS, top_k=3, parallel=False)
+    payload = app.test_client().get(f'/api/explore-matrices?n=600&seed=1&workers={WORKERS}&top=3').get_json()
+    assert payload['workers'] == WORKERS
+    assert [c['id'] for c in payload['candidates']] == [r['id'] for r in serial['results']]
+
+
+def test_seeded_run_extends_smaller_run():
+    # Jadwal chunk tidak bergantung pada n: run kecil adalah prefix run besar
+    full = explore_affine(2000, seed=11, poly='all', top_k=5)
+    head = explore_affine(700, seed=11, poly='all', top_k=5)
+    rest = explore_affine(2000, seed=11, poly='all', top_k=5, skip=700)
+    merged = merge_top(head['results'], rest['results'], 5)
+    assert [r['id'] for r in merged] == [r['id'] for r in full['results']]
+    assert head['passed'] + rest['passed'] == full['passed']
@@ -0,0 +1,14 @@
+# Konfigurasi gunicorn (dibaca otomatis dari direktori kerja: `gunicorn app_root:app`)
+import os
+
+# Worker gthread: heartbeat ke master tetap jalan selama request panjang
+# (stream explorer), jadi worker tidak di-kill oleh timeout seperti worker sync
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+
+def post_worker_init(worker):
+    # Worker job queue per proses gunicorn (thread dibuat setelah fork)
+    from app import start_job_workers
+    start_job_workers()